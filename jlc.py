@@ -2,41 +2,197 @@ import os
 import sys
 import time
 import json
+import logging
 import tempfile
 import random
+import re
+import calendar
+import contextvars
+import functools
+import threading
+import weakref
+import queue
+from types import MappingProxyType
 import requests
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver import ActionChains
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from serverchan_sdk import sc_send
 
-# 全局变量用于收集总结日志
-in_summary = False
-summary_logs = []
+# orjson 解析速度更快且可直接解析 bytes，未安装时回退到标准库 json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
-def log(msg):
-    full_msg = f"[{datetime.now().strftime('%H:%M:%S')}] {msg}"
-    print(full_msg, flush=True)
-    if in_summary:
-        summary_logs.append(msg)  # 只收集纯消息，无时间戳
+# 当前上下文的总结日志缓冲区，为 None 时不收集；账号工作线程的上下文中始终为 None
+summary_logs_var = contextvars.ContextVar('summary_logs', default=None)
+
+class _SummaryHandler(logging.Handler):
+    """把当前上下文中的日志纯消息（无时间戳）收集到总结缓冲区"""
+    def emit(self, record):
+        summary_logs = summary_logs_var.get()
+        if summary_logs is not None:
+            summary_logs.append(record.getMessage())
+
+def _build_logger():
+    """控制台输出由 Handler 自带的锁保护，多账号并发时不会交错"""
+    logger = logging.getLogger('jlc')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S'))
+    logger.addHandler(stream_handler)
+    logger.addHandler(_SummaryHandler())
+    return logger
+
+logger = _build_logger()
+
+# 同时处理的最大账号数，可通过环境变量 JLC_MAX_WORKERS 调整（每个并发账号占用一个 Chrome 进程）
+try:
+    MAX_WORKERS = max(1, int(os.getenv('JLC_MAX_WORKERS', '4')))
+except ValueError:
+    MAX_WORKERS = 4
+
+# 单个浏览器最多服务的账号次数，超过后关闭重启，避免长时间运行的内存增长
+MAX_USES_PER_BROWSER = 50
+
+# 金豆接口凭据（token + secretkey）和登录会话 Cookie 的本地缓存文件及有效期（秒）
+# 缓存内容等同于登录凭据，仅在显式设置 JLC_CACHE_FILE 时才写入磁盘
+CREDENTIAL_CACHE_FILE = os.path.expanduser(os.getenv('JLC_CACHE_FILE', ''))
+CACHE_ENABLED = bool(CREDENTIAL_CACHE_FILE)
+CREDENTIAL_CACHE_TTL = 6 * 3600
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 开源平台接口的固定请求头（Cookie 每次单独附加）
+OSHWHUB_BASE_HEADERS = MappingProxyType({
+    'user-agent': USER_AGENT,
+    'accept': 'application/json, text/plain, */*',
+})
+
+# 金豆接口的固定请求头（token 和 secretkey 按账号附加）
+JLC_BASE_HEADERS = MappingProxyType({
+    'user-agent': USER_AGENT,
+    'x-jlc-clienttype': 'WEB',
+    'accept': 'application/json, text/plain, */*',
+    'Referer': 'https://m.jlc.com/mapp/pages/my/index',
+})
+
+# 与签到无关的统计/分析域名，启动浏览器时直接解析失败，减少页面加载的请求
+BLOCKED_ANALYTICS_HOSTS = (
+    'hm.baidu.com',
+    '*.cnzz.com',
+    'www.google-analytics.com',
+    'www.googletagmanager.com',
+)
+
+# 通过 CDP 拦截的字体、音视频和监控上报资源（图片由浏览器设置禁用，样式表滑块验证需要，保持加载）
+BLOCKED_RESOURCE_PATTERNS = (
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*.mp4', '*.webm', '*.mp3',
+    '*sentry*', '*hotjar*', '*hm.baidu.com*',
+)
+
+# 资源拦截开关：设置环境变量 JLC_FAST_MODE=0 时加载全部资源，便于排查页面问题
+FAST_MODE = os.getenv('JLC_FAST_MODE', '1') != '0'
+
+# 签到流程中会访问的站点，复用浏览器前需要清理这些站点的数据
+SITE_ORIGINS = ('https://oshwhub.com', 'https://passport.jlc.com', 'https://m.jlc.com')
+
+# localStorage 中可能存放 AccessToken 的键名，按优先级排列
+TOKEN_STORAGE_KEYS = ('X-JLC-AccessToken', 'x-jlc-accesstoken', 'accessToken', 'token', 'jlc-token')
+
+# 页面元素定位器（按文本匹配的元素只能使用 XPath，其余优先使用 CSS 选择器）
+def _text_xpath(text, tags=('span', 'button', 'a')):
+    """生成匹配多种标签文本的 XPath 并集，一次查询覆盖所有候选元素"""
+    return ' | '.join(f'//{tag}[contains(text(),"{text}")]' for tag in tags)
+
+SIGNED_LOC = (By.XPATH, _text_xpath("已签到"))
+SIGN_BTN_LOC = (By.XPATH, _text_xpath("立即签到"))
+SIGN_STATE_LOC = (By.XPATH, f'{SIGN_BTN_LOC[1]} | {SIGNED_LOC[1]}')
+# 签到成功提示：只匹配以"签到成功"开头的文本元素，避免命中规则说明等包含该词的文案
+SIGN_SUCCESS_TOAST_LOC = (By.XPATH, ' | '.join(
+    f'//{tag}[starts-with(normalize-space(text()),"签到成功")]' for tag in ('span', 'p', 'div')))
+SEVEN_DAY_GIFT_LOC = (By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="7天好礼"]')
+MONTHLY_GIFT_LOC = (By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="月度好礼"]')
+REWARD_TEXT_LOC = (By.XPATH, '//p[contains(text(), "恭喜获取")]')
+ACCOUNT_LOGIN_BTN_LOC = (By.XPATH, '//button[contains(text(),"账号登录")]')
+USERNAME_INPUT_LOC = (By.CSS_SELECTOR, 'input[placeholder="请输入手机号码 / 客户编号 / 邮箱"]')
+PASSWORD_INPUT_LOC = (By.CSS_SELECTOR, 'input[type="password"]')
+LOGIN_SUBMIT_LOC = (By.CSS_SELECTOR, 'button.submit')
+SLIDER_BTN_LOC = (By.CSS_SELECTOR, '.btn_slide')
+SLIDER_TRACK_LOC = (By.CSS_SELECTOR, '.nc_scale')
+
+# 传输层重试：只对限流和网关类状态码的幂等请求退避重发；接口返回 success:false 等业务失败仍由调用方的重试逻辑处理
+_TRANSPORT_RETRY = Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                         raise_on_status=False)
+
+def _build_session(base_url, adapter=None):
+    """创建带连接池的 Session，复用 keep-alive 连接；传入 adapter 时与其他 Session 共用连接池"""
+    session = requests.Session()
+    if adapter is None:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_TRANSPORT_RETRY)
+    session.mount(base_url, adapter)
+    return session
+
+# 开源平台接口共用的 Session
+_oshwhub_session = _build_session("https://oshwhub.com")
+
+# m.jlc.com 的连接池：每个 JLCClient 的请求头各不相同，但底层 keep-alive 连接在所有账号间复用
+_jlc_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_TRANSPORT_RETRY)
+
+# 推送渠道共用的 Session
+_push_session = requests.Session()
+_push_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+_push_session.mount("http://", _push_adapter)
+_push_session.mount("https://", _push_adapter)
+
+# 对同一主机的接口调用至少间隔的秒数
+MIN_REQUEST_INTERVAL = 0.3
+_last_request_time = {}
+_rate_lock = threading.Lock()
+
+def _jlc_rate_gate(host):
+    """按主机限速：距上次调用不足 MIN_REQUEST_INTERVAL 时只补足差值"""
+    with _rate_lock:
+        now = time.monotonic()
+        wait_time = _last_request_time.get(host, 0) + MIN_REQUEST_INTERVAL - now
+        _last_request_time[host] = now + max(wait_time, 0)
+    if wait_time > 0:
+        time.sleep(wait_time)
+
+def log(msg, *args):
+    """输出带时间戳的日志；传入 args 时按 % 格式延迟到真正输出时再格式化"""
+    logger.info(msg, *args)
 
 def format_nickname(nickname):
     """格式化昵称，只显示第一个字和最后一个字，中间用星号代替"""
-    if not nickname or len(nickname.strip()) == 0:
+    nickname = nickname.strip() if nickname else ""
+    length = len(nickname)
+    if length == 0:
         return "未知用户"
-    
-    nickname = nickname.strip()
-    if len(nickname) == 1:
-        return f"{nickname}*"
-    elif len(nickname) == 2:
-        return f"{nickname[0]}*"
-    else:
-        return f"{nickname[0]}{'*' * (len(nickname)-2)}{nickname[-1]}"
+    if length == 1:
+        return nickname + "*"
+    if length == 2:
+        return nickname[0] + "*"
+    return nickname[0] + "*" * (length - 2) + nickname[-1]
+
+def backoff_delay(attempt, base=1, cap=30):
+    """指数退避 + 全抖动：在 [0, min(cap, base * 2^attempt)] 内随机取值"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def failure_backoff(failures):
+    """连续失败 failures 次后的等待秒数：按指数增长（上限 30 秒），附加不超过 1 秒的抖动"""
+    return min(30, 2 ** failures) + random.uniform(0, 1)
 
 def with_retry(func, max_retries=5, delay=1):
     """如果函数返回None或抛出异常，静默重试"""
@@ -46,48 +202,148 @@ def with_retry(func, max_retries=5, delay=1):
                 result = func(*args, **kwargs)
                 if result is not None:
                     return result
-                time.sleep(delay + random.uniform(0, 1))  # 随机延迟
             except Exception:
-                time.sleep(delay + random.uniform(0, 1))  # 随机延迟
+                pass
+            if attempt < max_retries - 1:
+                time.sleep(backoff_delay(attempt, delay))  # 指数退避随机延迟
         return None
     return wrapper
 
+# 按顺序探测所有候选键，返回第一个命中的 [存储名, 键名, 值]
+# 已知键都没有时，再按键名匹配 token 扫描全部存储项，兼容键名带前缀的情况
+TOKEN_LOOKUP_SCRIPT = """
+    var keys = arguments[0];
+    var stores = [['localStorage', window.localStorage], ['sessionStorage', window.sessionStorage]];
+    for (var s = 0; s < stores.length; s++) {
+        for (var i = 0; i < keys.length; i++) {
+            var value = stores[s][1].getItem(keys[i]);
+            if (value) return [stores[s][0], keys[i], value];
+        }
+    }
+    for (var s = 0; s < stores.length; s++) {
+        var names = Object.keys(stores[s][1]);
+        for (var i = 0; i < names.length; i++) {
+            if (!/token/i.test(names[i])) continue;
+            var value = stores[s][1].getItem(names[i]);
+            if (value && value.length > 20) return [stores[s][0], names[i], value];
+        }
+    }
+    return null;
+"""
+
+# 同一次脚本调用中同时取得 token 探测结果和钩子捕获的 secretkey
+CREDENTIALS_SCRIPT = (
+    "var token = (function () {" + TOKEN_LOOKUP_SCRIPT + "}).apply(null, arguments);"
+    "return {token: token, secretkey: window.sessionStorage.getItem('__jlc_secretkey')};"
+)
+
+def _token_from_lookup(found):
+    """记录并返回 TOKEN_LOOKUP_SCRIPT 的命中结果"""
+    if not found:
+        return None
+    storage, key, token = found
+    if key == TOKEN_STORAGE_KEYS[0]:
+        log(f"? 成功从 {storage} 提取 token: {token[:30]}...")
+    else:
+        log(f"? 从 {storage} 的 {key} 提取到 token: {token[:30]}...")
+    return token
+
 @with_retry
 def extract_token_from_local_storage(driver):
-    """从 localStorage 提取 X-JLC-AccessToken"""
+    """从 localStorage（其次 sessionStorage）提取 X-JLC-AccessToken"""
     try:
-        token = driver.execute_script("return window.localStorage.getItem('X-JLC-AccessToken');")
-        if token:
-            log(f"? 成功从 localStorage 提取 token: {token[:30]}...")
-            return token
-        else:
-            alternative_keys = [
-                "x-jlc-accesstoken",
-                "accessToken", 
-                "token",
-                "jlc-token"
-            ]
-            for key in alternative_keys:
-                token = driver.execute_script(f"return window.localStorage.getItem('{key}');")
-                if token:
-                    log(f"? 从 localStorage 的 {key} 提取到 token: {token[:30]}...")
-                    return token
+        return _token_from_lookup(driver.execute_script(TOKEN_LOOKUP_SCRIPT, list(TOKEN_STORAGE_KEYS)))
     except Exception as e:
         log(f"? 从 localStorage 提取 token 失败: {e}")
     
     return None
 
-@with_retry
+def extract_credentials(driver):
+    """提取 (token, secretkey)：先用一次脚本调用同时读取两者，缺少的再分别按原有方式（含重试）提取"""
+    try:
+        found = driver.execute_script(CREDENTIALS_SCRIPT, list(TOKEN_STORAGE_KEYS)) or {}
+    except Exception:
+        found = {}
+    
+    access_token = _token_from_lookup(found.get('token'))
+    secretkey = found.get('secretkey')
+    if secretkey:
+        log(f"? 从页面请求头中捕获到 secretkey: {secretkey[:20]}...")
+    
+    if not access_token:
+        access_token = extract_token_from_local_storage(driver)
+    if not secretkey:
+        secretkey = extract_secretkey_from_devtools(driver)
+    return access_token, secretkey
+
+# 页面加载前注入的脚本：在浏览器内拦截 XHR / fetch 请求头，捕获到的 secretkey 存入 sessionStorage
+SECRETKEY_HOOK_SCRIPT = """
+(function () {
+    function capture(name, value) {
+        if (value && String(name).toLowerCase() === 'secretkey') {
+            try { window.sessionStorage.setItem('__jlc_secretkey', value); } catch (e) {}
+        }
+    }
+    var setRequestHeader = XMLHttpRequest.prototype.setRequestHeader;
+    XMLHttpRequest.prototype.setRequestHeader = function (name, value) {
+        capture(name, value);
+        return setRequestHeader.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input, init) {
+            try {
+                var headers = (init && init.headers) || (input && input.headers);
+                if (headers && typeof headers.forEach === 'function' && !Array.isArray(headers)) {
+                    headers.forEach(function (v, k) { capture(k, v); });
+                } else if (Array.isArray(headers)) {
+                    headers.forEach(function (pair) { capture(pair[0], pair[1]); });
+                } else if (headers) {
+                    Object.keys(headers).forEach(function (k) { capture(k, headers[k]); });
+                }
+            } catch (e) {}
+            return originalFetch.apply(this, arguments);
+        };
+    }
+})();
+"""
+
+def find_secretkey(headers):
+    """从请求头中查找 secretkey（不区分大小写）"""
+    return next((v for k, v in headers.items() if k.lower() == 'secretkey'), None)
+
+# performance 日志预筛：匹配任意大小写的 secretkey
+SECRETKEY_LOG_RE = re.compile('secretkey', re.IGNORECASE)
+
 def extract_secretkey_from_devtools(driver):
     """使用 DevTools 从网络请求中提取 secretkey"""
-    secretkey = None
+    # 优先读取页面内钩子捕获的 secretkey；页面接口请求可能稍晚发出，只在这里短暂等待一次钩子写入
+    try:
+        secretkey = WebDriverWait(driver, 3, poll_frequency=0.2).until(
+            lambda d: d.execute_script("return window.sessionStorage.getItem('__jlc_secretkey');")
+        )
+        log(f"? 从页面请求头中捕获到 secretkey: {secretkey[:20]}...")
+        return secretkey
+    except Exception:
+        pass
     
+    # 钩子未捕获到时，回退到解析 performance 日志（只有这一步需要重试）
+    return _scan_performance_log_for_secretkey(driver)
+
+@with_retry
+def _scan_performance_log_for_secretkey(driver):
+    """解析 performance 日志中 m.jlc.com 请求的请求头，提取 secretkey"""
+    secretkey = None
     try:
         logs = driver.get_log('performance')
         
         for entry in logs:
             try:
-                message = json.loads(entry['message'])
+                raw = entry['message']
+                # 先做子串和预编译正则预筛（忽略大小写且不生成小写副本），跳过无关日志，避免逐条解析 JSON
+                if 'm.jlc.com' not in raw or not SECRETKEY_LOG_RE.search(raw):
+                    continue
+                message = json_loads(raw)
                 message_type = message.get('message', {}).get('method', '')
                 
                 if message_type == 'Network.requestWillBeSent':
@@ -96,12 +352,7 @@ def extract_secretkey_from_devtools(driver):
                     
                     if 'm.jlc.com' in url:
                         headers = request.get('headers', {})
-                        secretkey = (
-                            headers.get('secretkey') or 
-                            headers.get('SecretKey') or
-                            headers.get('secretKey') or
-                            headers.get('SECRETKEY')
-                        )
+                        secretkey = find_secretkey(headers)
                         
                         if secretkey:
                             log(f"? 从请求中提取到 secretkey: {secretkey[:20]}...")
@@ -113,12 +364,7 @@ def extract_secretkey_from_devtools(driver):
                     
                     if 'm.jlc.com' in url:
                         headers = response.get('requestHeaders', {})
-                        secretkey = (
-                            headers.get('secretkey') or 
-                            headers.get('SecretKey') or
-                            headers.get('secretKey') or
-                            headers.get('SECRETKEY')
-                        )
+                        secretkey = find_secretkey(headers)
                         
                         if secretkey:
                             log(f"? 从响应中提取到 secretkey: {secretkey[:20]}...")
@@ -132,37 +378,230 @@ def extract_secretkey_from_devtools(driver):
     
     return secretkey
 
+def wait_page_ready(driver, timeout=10):
+    """等待页面加载完成（document.readyState 为 complete）"""
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+
+def _is_login_redirected(driver):
+    current_url = driver.current_url
+    return "oshwhub.com" in current_url and "passport.jlc.com" not in current_url
+
+def wait_login_redirect(driver, timeout=15):
+    """等待登录后跳转回开源平台，超时抛出 TimeoutException"""
+    WebDriverWait(driver, timeout, poll_frequency=0.2).until(_is_login_redirected)
+
+# 按浏览器缓存昵称查询时拿到的用户信息，供紧随其后的积分查询复用（只复用一次）
+_oshwhub_user_cache = weakref.WeakKeyDictionary()
+
+# 按浏览器缓存上一次通过认证的 Cookie 串，登录后的多次查询无需重复读取 Cookie
+_oshwhub_cookie_cache = weakref.WeakKeyDictionary()
+
+def _parse_oshwhub_user(response):
+    data = json_loads(response.content) if response.status_code == 200 else None
+    if data and data.get('success'):
+        user = data.get('result', {})
+        return user.get('nickname', ''), user.get('points', 0)
+    return None
+
+def _request_oshwhub_user(cookie_str):
+    """携带指定 Cookie 请求开源平台用户信息接口"""
+    headers = {**OSHWHUB_BASE_HEADERS, 'cookie': cookie_str}
+    return _oshwhub_session.get("https://oshwhub.com/api/users", headers=headers, timeout=10)
+
+def _fetch_oshwhub_user(driver):
+    """调用开源平台用户信息接口，返回 (昵称, 积分)，失败返回 None"""
+    cookie_str = _oshwhub_cookie_cache.get(driver)
+    if cookie_str is not None:
+        user = _parse_oshwhub_user(_request_oshwhub_user(cookie_str))
+        if user is not None:
+            return user
+        del _oshwhub_cookie_cache[driver]  # 缓存的 Cookie 已失效，重新读取
+    
+    # document.cookie 直接得到 name=value 串，比 get_cookies() 传输的数据少得多
+    cookie_str = driver.execute_script("return document.cookie")
+    response = _request_oshwhub_user(cookie_str)
+    user = _parse_oshwhub_user(response)
+    
+    if user is None and response.status_code in (200, 401):
+        # document.cookie 不含 HttpOnly Cookie，未通过认证时改用完整的 Cookie 列表
+        cookies = driver.get_cookies()
+        cookie_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies])
+        user = _parse_oshwhub_user(_request_oshwhub_user(cookie_str))
+    
+    if user is not None:
+        _oshwhub_cookie_cache[driver] = cookie_str
+    return user
+
+def stop_performance_logging(driver):
+    """secretkey 提取完成后清空已缓冲的 performance 日志；未启用资源拦截时同时停止 Network 事件记录
+
+    资源拦截（Network.setBlockedURLs）依赖 Network 域，关闭后拦截列表随之失效，因此 FAST_MODE 下保持开启
+    """
+    try:
+        if not FAST_MODE:
+            driver.execute_cdp_cmd('Network.disable', {})
+        driver.get_log('performance')  # 读取一次即清空缓冲区
+    except Exception:
+        pass
+
+_credential_cache_lock = threading.Lock()
+
+def _read_credential_cache():
+    try:
+        with open(CREDENTIAL_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _load_cache_entry(key):
+    """读取未过期的缓存项，没有、已过期或未启用缓存时返回 None"""
+    if not CACHE_ENABLED:
+        return None
+    with _credential_cache_lock:
+        entry = _read_credential_cache().get(key)
+    if entry and time.time() - entry.get('saved_at', 0) < CREDENTIAL_CACHE_TTL:
+        return entry
+    return None
+
+def _update_cache(key, entry):
+    """写入（entry 为 None 时删除）缓存项，先写临时文件再替换，文件权限仅限当前用户；未启用缓存时不做任何事"""
+    if not CACHE_ENABLED:
+        return
+    with _credential_cache_lock:
+        cache = _read_credential_cache()
+        if entry is None:
+            if cache.pop(key, None) is None:
+                return
+        else:
+            cache[key] = {**entry, 'saved_at': time.time()}
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CREDENTIAL_CACHE_FILE) or '.')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, CREDENTIAL_CACHE_FILE)
+        except (OSError, TypeError, ValueError) as e:
+            log(f"? 写入凭据缓存失败: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+def load_cached_credentials(username):
+    """读取未过期的缓存凭据，返回 (access_token, secretkey)，没有则返回 None"""
+    entry = _load_cache_entry(username)
+    if entry:
+        return entry['access_token'], entry['secretkey']
+    return None
+
+def save_cached_credentials(username, access_token, secretkey):
+    """写入金豆接口凭据缓存"""
+    _update_cache(username, {'access_token': access_token, 'secretkey': secretkey})
+
+# Network.setCookies 接受的 Cookie 字段
+COOKIE_PARAM_KEYS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+def _session_cache_key(username):
+    return 'session:' + username
+
+def save_login_session(driver, username):
+    """登录成功后缓存所有站点的 Cookie（含 HttpOnly），供下次运行跳过登录"""
+    if not CACHE_ENABLED:
+        return
+    try:
+        cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    except Exception:
+        return
+    _update_cache(_session_cache_key(username), {'cookies': cookies})
+
+def drop_login_session(username):
+    """删除已失效的登录会话缓存"""
+    _update_cache(_session_cache_key(username), None)
+
+def restore_login_session(driver, username, account_index):
+    """尝试用缓存的 Cookie 恢复开源平台登录状态，返回是否已登录；登录失败时会话缓存随之作废"""
+    entry = _load_cache_entry(_session_cache_key(username))
+    if not entry:
+        return False
+    
+    cookies = []
+    for cookie in entry['cookies']:
+        param = {k: cookie[k] for k in COOKIE_PARAM_KEYS if k in cookie}
+        if cookie.get('session') or param.get('expires', 0) <= 0:
+            param.pop('expires', None)  # 会话 Cookie 不带过期时间
+        cookies.append(param)
+    
+    try:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+        driver.get("https://oshwhub.com/sign_in")
+        if _is_login_redirected(driver) and _fetch_oshwhub_user(driver) is not None:
+            log(f"账号 {account_index} - 已使用缓存的登录状态，跳过登录流程")
+            return True
+    except Exception:
+        pass
+    
+    log(f"账号 {account_index} - 缓存的登录状态已失效，重新登录")
+    drop_login_session(username)
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception:
+        pass
+    return False
+
+def fetch_oshwhub_points_by_cookie(cookie_str, max_retries=3):
+    """只凭 Cookie 串查询开源平台积分（不访问浏览器，可在后台线程执行），失败返回 None"""
+    for attempt in range(max_retries):
+        try:
+            user = _parse_oshwhub_user(_request_oshwhub_user(cookie_str))
+            if user is not None:
+                return user[1]
+        except Exception:
+            pass  # 静默重试
+        if attempt < max_retries - 1:
+            time.sleep(backoff_delay(attempt))
+    return None
+
+def record_final_points(result, final_points, account_index):
+    """记录签到后积分并计算积分差值"""
+    result['final_points'] = final_points if final_points is not None else 0
+    log(f"账号 {account_index} - 签到后积分??: {result['final_points']}")
+
+    # 8. 计算积分差值
+    result['points_reward'] = result['final_points'] - result['initial_points']
+    if result['points_reward'] > 0:
+        log(f"账号 {account_index} - ?? 总积分增加: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
+    elif result['points_reward'] == 0:
+        log(f"账号 {account_index} - ? 总积分无变化，可能今天已签到过: {result['initial_points']} → {result['final_points']} (0)")
+    else:
+        log(f"账号 {account_index} - ? 积分减少: {result['initial_points']} → {result['final_points']} ({result['points_reward']})")
+
 def get_oshwhub_points(driver, account_index):
     """获取开源平台积分数量"""
+    cached = _oshwhub_user_cache.pop(driver, None)
+    if cached is not None:
+        return cached[1]
+    
     max_retries = 5
     for attempt in range(max_retries):
         try:
-            # 获取当前页面的Cookie
-            cookies = driver.get_cookies()
-            cookie_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies])
-            
-            headers = {
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'accept': 'application/json, text/plain, */*',
-                'cookie': cookie_str
-            }
-            
             # 调用用户信息API获取积分
-            response = requests.get("https://oshwhub.com/api/users", headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data and data.get('success'):
-                    points = data.get('result', {}).get('points', 0)
-                    return points
+            user = _fetch_oshwhub_user(driver)
+            if user is not None:
+                return user[1]
         except Exception:
             pass  # 静默重试
         
-        # 重试前刷新页面
+        # 重试前刷新页面；已有通过认证的 Cookie 时问题出在接口本身，只需退避后重新请求
         if attempt < max_retries - 1:
             try:
-                driver.refresh()
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                time.sleep(1 + random.uniform(0, 1))
+                if driver not in _oshwhub_cookie_cache:
+                    driver.refresh()
+                    wait_page_ready(driver)
+                time.sleep(backoff_delay(attempt))
             except:
                 pass
     
@@ -174,14 +613,9 @@ class JLCClient:
     
     def __init__(self, access_token, secretkey, account_index, driver):
         self.base_url = "https://m.jlc.com"
-        self.headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'x-jlc-clienttype': 'WEB',
-            'accept': 'application/json, text/plain, */*',
-            'x-jlc-accesstoken': access_token,
-            'secretkey': secretkey,
-            'Referer': 'https://m.jlc.com/mapp/pages/my/index',
-        }
+        self.headers = {**JLC_BASE_HEADERS, 'x-jlc-accesstoken': access_token, 'secretkey': secretkey}
+        self.session = _build_session(self.base_url, _jlc_adapter)
+        self.session.headers.update(self.headers)
         self.account_index = account_index
         self.driver = driver
         self.message = ""
@@ -193,14 +627,15 @@ class JLCClient:
         
     def send_request(self, url, method='GET'):
         """发送 API 请求"""
+        _jlc_rate_gate(self.base_url)
         try:
             if method.upper() == 'GET':
-                response = requests.get(url, headers=self.headers, timeout=10)
+                response = self.session.get(url, timeout=10)
             else:
-                response = requests.post(url, headers=self.headers, timeout=10)
+                response = self.session.post(url, timeout=10)
             
             if response.status_code == 200:
-                return response.json()
+                return json_loads(response.content)
             else:
                 log(f"账号 {self.account_index} - ? 请求失败，状态码: {response.status_code}")
                 return None
@@ -230,23 +665,24 @@ class JLCClient:
             data = self.send_request(url)
             
             if data and data.get('success'):
-                jindou_count = data.get('data', {}).get('integralVoucher', 0)
+                jindou_count = (data.get('data') or {}).get('integralVoucher', 0)
                 return jindou_count
             
             # 重试前刷新页面，重新提取 token 和 secretkey
             if attempt < max_retries - 1:
+                if self.driver is None:
+                    # 未使用浏览器（金豆单独重试）时，只等待后重新请求
+                    time.sleep(backoff_delay(attempt))
+                    continue
                 try:
-                    self.driver.get("https://m.jlc.com/")
-                    self.driver.refresh()
-                    WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(1 + random.uniform(0, 1))
+                    self.driver.get("https://m.jlc.com/")  # 重新打开页面即可，无需再额外刷新一次
+                    time.sleep(backoff_delay(attempt))
                     navigate_and_interact_m_jlc(self.driver, self.account_index)
-                    access_token = extract_token_from_local_storage(self.driver)
-                    secretkey = extract_secretkey_from_devtools(self.driver)
+                    access_token, secretkey = extract_credentials(self.driver)
                     if access_token:
-                        self.headers['x-jlc-accesstoken'] = access_token
+                        self.session.headers['x-jlc-accesstoken'] = access_token
                     if secretkey:
-                        self.headers['secretkey'] = secretkey
+                        self.session.headers['secretkey'] = secretkey
                 except:
                     pass  # 静默继续
         
@@ -260,7 +696,7 @@ class JLCClient:
         data = self.send_request(url)
         
         if data and data.get('success'):
-            have_sign_in = data.get('data', {}).get('haveSignIn', False)
+            have_sign_in = (data.get('data') or {}).get('haveSignIn', False)
             if have_sign_in:
                 log(f"账号 {self.account_index} - ? 今日已签到")
                 self.sign_status = "已签到过"
@@ -282,7 +718,7 @@ class JLCClient:
         data = self.send_request(url)
         
         if data and data.get('success'):
-            gain_num = data.get('data', {}).get('gainNum')
+            gain_num = (data.get('data') or {}).get('gainNum')
             if gain_num:
                 # 直接签到成功，获得金豆
                 log(f"账号 {self.account_index} - ? 签到成功，签到使金豆+{gain_num}")
@@ -343,16 +779,12 @@ class JLCClient:
         if not self.get_user_info():
             return False
         
-        time.sleep(random.randint(1, 2))
-        
         # 2. 获取签到前金豆数量
         self.initial_jindou = self.get_points()
         if self.initial_jindou is None:
             self.initial_jindou = 0
         log(f"账号 {self.account_index} - 签到前金豆??: {self.initial_jindou}")
         
-        time.sleep(random.randint(1, 2))
-        
         # 3. 检查签到状态
         sign_status = self.check_sign_status()
         if sign_status is None:  # 检查失败
@@ -362,11 +794,12 @@ class JLCClient:
             log(f"账号 {self.account_index} - 今日已签到，跳过签到操作")
         else:  # 未签到
             # 4. 执行签到
-            time.sleep(random.randint(2, 3))
             if not self.sign_in():
                 return False
-        
-        time.sleep(random.randint(1, 2))
+            
+            # 刚签到时给服务端留出更新金豆的时间；已签到过则金豆不会变化，无需等待
+            # 其余接口调用间隔由 _jlc_rate_gate 控制
+            time.sleep(random.uniform(1, 2))
         
         # 5. 获取签到后金豆数量
         self.final_jindou = self.get_points()
@@ -384,9 +817,8 @@ def navigate_and_interact_m_jlc(driver, account_index):
     log(f"账号 {account_index} - 在 m.jlc.com 进行交互操作...")
     
     try:
-        WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        wait_page_ready(driver, 12)
         driver.execute_script("window.scrollTo(0, 300);")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         
         nav_selectors = [
             "//div[contains(text(), '我的')]",
@@ -396,40 +828,55 @@ def navigate_and_interact_m_jlc(driver, account_index):
             "//a[contains(@href, 'center')]",
         ]
         
-        for selector in nav_selectors:
-            try:
-                element = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, selector)))
-                element.click()
-                log(f"账号 {account_index} - 点击导航元素: {selector}")
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                break
-            except:
-                continue
+        # 在页面内一次性按顺序匹配所有导航选择器，点击第一个可见元素并返回其选择器
+        click_script = """
+            var selectors = arguments[0];
+            for (var i = 0; i < selectors.length; i++) {
+                var el = document.evaluate(selectors[i], document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                if (el && el.offsetParent !== null) {
+                    el.click();
+                    return selectors[i];
+                }
+            }
+            return null;
+        """
+        try:
+            selector = WebDriverWait(driver, 5).until(lambda d: d.execute_script(click_script, nav_selectors))
+            log(f"账号 {account_index} - 点击导航元素: {selector}")
+            wait_page_ready(driver)
+        except:
+            pass
         
-        driver.execute_script("window.scrollTo(0, 500);")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        # 刷新会重置滚动位置，刷新前无需再滚动
         driver.refresh()
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        wait_page_ready(driver)
         
     except Exception as e:
         log(f"账号 {account_index} - 交互操作出错: {e}")
 
+@functools.lru_cache(maxsize=None)
+def _is_sunday_for(day):
+    return day.weekday() == 6
+
+@functools.lru_cache(maxsize=None)
+def _last_day_for(year, month):
+    return calendar.monthrange(year, month)[1]
+
 def is_sunday():
     """检查今天是否是周日"""
-    return datetime.now().weekday() == 6
+    return _is_sunday_for(date.today())
 
 def is_last_day_of_month():
     """检查今天是否是当月最后一天"""
-    today = datetime.now()
-    next_month = today.replace(day=28) + timedelta(days=4)
-    last_day = next_month - timedelta(days=next_month.day)
-    return today.day == last_day.day
+    today = date.today()
+    return today.day == _last_day_for(today.year, today.month)
 
 def capture_reward_info(driver, account_index, gift_type):
     """抓取并输出奖励信息，返回礼包领取结果"""
     try:
         reward_elem = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, '//p[contains(text(), "恭喜获取")]'))
+            EC.presence_of_element_located(REWARD_TEXT_LOC)
         )
         reward_text = reward_elem.text.strip()
         gift_name = "七日礼包" if gift_type == "7天" else "月度礼包"
@@ -439,54 +886,107 @@ def capture_reward_info(driver, account_index, gift_type):
         log(f"账号 {account_index} - 已点击{gift_type}好礼，未获取到奖励信息(可能已领取过或未达到领取条件)，请自行前往开源平台查看。")
         return None
 
+def any_of(*conditions):
+    """任一条件满足即返回其结果（与 Selenium 4 的 EC.any_of 相同，当前 Selenium 版本未提供）"""
+    def _predicate(driver):
+        for condition in conditions:
+            try:
+                result = condition(driver)
+                if result:
+                    return result
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+        return False
+    return _predicate
+
+def sign_confirmed():
+    """点击签到后的确认条件：可见的成功提示弹出，或按钮变为"已签到"，任一出现即可"""
+    return any_of(
+        EC.visibility_of_element_located(SIGN_SUCCESS_TOAST_LOC),
+        EC.presence_of_element_located(SIGNED_LOC)
+    )
+
+def probe_sign_page(driver, click_sign_btn=False):
+    """一次脚本调用获取签到页状态：是否已签到、是否有签到按钮
+
+    click_sign_btn 为 True 时，未签到且存在签到按钮则在同一次调用中直接点击，clicked 表示是否已点击
+    """
+    return driver.execute_script("""
+        function find(xpath) {
+            return document.evaluate(xpath, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        var signed = find(arguments[0]) !== null;
+        var btn = find(arguments[1]);
+        var clicked = false;
+        if (arguments[2] && !signed && btn) {
+            btn.click();
+            clicked = true;
+        }
+        return {signed: signed, sign_btn: btn !== null, clicked: clicked};
+    """, SIGNED_LOC[1], SIGN_BTN_LOC[1], click_sign_btn)
+
+def click_by_xpath(driver, xpath):
+    """在页面内一次脚本调用完成查找和点击，返回是否找到并点击了元素"""
+    return driver.execute_script("""
+        var el = document.evaluate(arguments[0], document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (!el) return false;
+        el.click();
+        return true;
+    """, xpath)
+
 def click_gift_buttons(driver, account_index):
     """根据日期条件点击7天好礼和月度好礼按钮，并抓取奖励信息，返回所有领取结果"""
     reward_results = []
     
-    if not is_sunday() and not is_last_day_of_month():
+    sunday = is_sunday()
+    last_day = is_last_day_of_month()
+    if not sunday and not last_day:
         return reward_results
 
     try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        wait_page_ready(driver)
         
         log(f"账号 {account_index} - 开始点击礼包按钮...")
-        
-        sunday = is_sunday()
-        last_day = is_last_day_of_month()
 
         if sunday:
-            # 尝试点击7天好礼
+            # 尝试点击7天好礼（查找和点击在同一次脚本调用中完成，找不到时返回 False）
             try:
-                seven_day_gift = driver.find_element(By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="7天好礼"]')
-                seven_day_gift.click()
-                log(f"账号 {account_index} - ? 检测到今天是周日，成功点击7天好礼，祝你周末愉快~")
-                
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                reward_result = capture_reward_info(driver, account_index, "7天")
-                if reward_result:
-                    reward_results.append(reward_result)
-                
-                # 如果也是月底，刷新页面
-                if last_day:
-                    driver.refresh()
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    time.sleep(12)
-                
+                if click_by_xpath(driver, SEVEN_DAY_GIFT_LOC[1]):
+                    log(f"账号 {account_index} - ? 检测到今天是周日，成功点击7天好礼，祝你周末愉快~")
+                    
+                    reward_result = capture_reward_info(driver, account_index, "7天")
+                    if reward_result:
+                        reward_results.append(reward_result)
+                    
+                    # 如果也是月底，刷新页面并等待月度好礼按钮重新渲染
+                    if last_day:
+                        driver.refresh()
+                        try:
+                            WebDriverWait(driver, 12, poll_frequency=0.2).until(
+                                lambda d: d.find_elements(*MONTHLY_GIFT_LOC)
+                            )
+                        except TimeoutException:
+                            pass  # 交由下方的查找给出"未找到按钮"提示
+                else:
+                    log(f"账号 {account_index} - ? 无法点击7天好礼: 未找到按钮")
+                    
             except Exception as e:
                 log(f"账号 {account_index} - ? 无法点击7天好礼: {e}")
 
         if last_day:
             # 尝试点击月度好礼
             try:
-                monthly_gift = driver.find_element(By.XPATH, '//div[contains(@class, "sign_text__r9zaN")]/span[text()="月度好礼"]')
-                monthly_gift.click()
-                log(f"账号 {account_index} - ? 检测到今天是月底，成功点击月度好礼～")          
-                
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                reward_result = capture_reward_info(driver, account_index, "月度")
-                if reward_result:
-                    reward_results.append(reward_result)
-                
+                if click_by_xpath(driver, MONTHLY_GIFT_LOC[1]):
+                    log(f"账号 {account_index} - ? 检测到今天是月底，成功点击月度好礼～")
+                    
+                    reward_result = capture_reward_info(driver, account_index, "月度")
+                    if reward_result:
+                        reward_results.append(reward_result)
+                else:
+                    log(f"账号 {account_index} - ? 无法点击月度好礼: 未找到按钮")
+                    
             except Exception as e:
                 log(f"账号 {account_index} - ? 无法点击月度好礼: {e}")
             
@@ -499,26 +999,15 @@ def click_gift_buttons(driver, account_index):
 def get_user_nickname_from_api(driver, account_index):
     """通过API获取用户昵称"""
     try:
-        # 获取当前页面的Cookie
-        cookies = driver.get_cookies()
-        cookie_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies])
-        
-        headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'accept': 'application/json, text/plain, */*',
-            'cookie': cookie_str
-        }
-        
-        # 调用用户信息API
-        response = requests.get("https://oshwhub.com/api/users", headers=headers, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data and data.get('success'):
-                nickname = data.get('result', {}).get('nickname', '')
-                if nickname:
-                    formatted_nickname = format_nickname(nickname)
-                    log(f"账号 {account_index} - ?? 昵称: {formatted_nickname}")
-                    return formatted_nickname
+        # 调用用户信息API，结果留给随后的积分查询复用
+        user = _fetch_oshwhub_user(driver)
+        if user is not None:
+            _oshwhub_user_cache[driver] = user
+            nickname = user[0]
+            if nickname:
+                formatted_nickname = format_nickname(nickname)
+                log(f"账号 {account_index} - ?? 昵称: {formatted_nickname}")
+                return formatted_nickname
         
         log(f"账号 {account_index} - ? 无法获取用户昵称")
         return None
@@ -526,124 +1015,269 @@ def get_user_nickname_from_api(driver, account_index):
         log(f"账号 {account_index} - ? 获取用户昵称失败: {e}")
         return None
 
-def ensure_login_page(driver, account_index):
-    """确保进入登录页面，如果未检测到登录页面则重启浏览器"""
+def _block_heavy_resources(driver):
+    """开启 Network 域并拦截 BLOCKED_RESOURCE_PATTERNS 中的资源（FAST_MODE 关闭时只开启 Network 域）"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        if FAST_MODE:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(BLOCKED_RESOURCE_PATTERNS)})
+    except Exception:
+        pass
+
+def _build_driver(user_data_dir=None):
+    """创建 Chrome 浏览器实例，传入 user_data_dir 时复用已有的用户数据目录"""
+    if user_data_dir is None:
+        user_data_dir = tempfile.mkdtemp()
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    if FAST_MODE:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # 禁用图像加载
+    # 关闭与签到无关的后台功能
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--metrics-recording-only")
+    if FAST_MODE:
+        chrome_options.add_argument(
+            "--host-resolver-rules=" + ", ".join(f"MAP {host} ~NOTFOUND" for host in BLOCKED_ANALYTICS_HOSTS)
+        )
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # 样式表保持加载，滑块验证需要依赖真实的元素尺寸
+    prefs = {'profile.default_content_setting_values.notifications': 2}
+    if FAST_MODE:
+        prefs['profile.managed_default_content_settings.images'] = 2
+    chrome_options.add_experimental_option('prefs', prefs)
+
+    caps = DesiredCapabilities.CHROME.copy()
+    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
+    caps['pageLoadStrategy'] = 'eager'  # DOMContentLoaded 后即返回，不等待全部子资源
+
+    driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
+    _prepare_page_target(driver)
+    return driver, user_data_dir
+
+def _prepare_page_target(driver):
+    """对当前页面目标注入 secretkey 捕获脚本并开启资源拦截（CDP 设置按页面目标生效）"""
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    # 在每个新文档加载前注入 secretkey 捕获脚本，由浏览器端完成过滤
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': SECRETKEY_HOOK_SCRIPT})
+    except Exception as e:
+        log(f"? 注入 secretkey 捕获脚本失败，将使用 performance 日志: {e}")
+    _block_heavy_resources(driver)
+
+def ensure_login_page(driver, account_index, user_data_dir=None):
+    """确保进入登录页面，返回 (是否进入登录页, 当前使用的浏览器)
+
+    未检测到登录页面时，先清理 Cookie 和本地存储后原地重试，仍失败再重启浏览器
+    """
     max_restarts = 5
+    in_place_attempts = 2  # 前两次失败只清理状态，不重启浏览器
     restarts = 0
+    last_error = None
     
     while restarts < max_restarts:
         try:
             driver.get("https://oshwhub.com/sign_in")
             log(f"账号 {account_index} - 已打开 JLC 签到页")
             
-            WebDriverWait(driver, 10).until(lambda d: "passport.jlc.com/login" in d.current_url)
-            current_url = driver.current_url
-
             # 检查是否在登录页面
-            if "passport.jlc.com/login" in current_url:
-                log(f"账号 {account_index} - ? 检测到未登录状态")
-                return True
-            else:
-                restarts += 1
-                if restarts < max_restarts:
-                    # 静默重启浏览器
-                    driver.quit()
-                    
-                    # 重新初始化浏览器
-                    chrome_options = Options()
-                    chrome_options.add_argument("--headless=new")
-                    chrome_options.add_argument("--no-sandbox")
-                    chrome_options.add_argument("--disable-dev-shm-usage")
-                    chrome_options.add_argument("--disable-gpu")
-                    chrome_options.add_argument("--window-size=1920,1080")
-                    chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-                    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-                    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-                    caps = DesiredCapabilities.CHROME
-                    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-                    
-                    driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-                    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                    
-                    # 静默等待后继续循环
-                    time.sleep(2)
-                else:
-                    log(f"账号 {account_index} - ? 重启浏览器{max_restarts}次后仍无法进入登录页面")
-                    return False
-                    
+            WebDriverWait(driver, 10).until(lambda d: "passport.jlc.com/login" in d.current_url)
+            log(f"账号 {account_index} - ? 检测到未登录状态")
+            return True, driver
         except Exception as e:
-            restarts += 1
-            if restarts < max_restarts:
-                try:
-                    driver.quit()
-                except:
-                    pass
-                
-                # 重新初始化浏览器
-                chrome_options = Options()
-                chrome_options.add_argument("--headless=new")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--window-size=1920,1080")
-                chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-                chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-                chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                chrome_options.add_experimental_option('useAutomationExtension', False)
-
-                caps = DesiredCapabilities.CHROME
-                caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-                
-                driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                
-                time.sleep(2)
-            else:
-                log(f"账号 {account_index} - ? 重启浏览器{max_restarts}次后仍出现异常: {e}")
-                return False
+            last_error = e
+        
+        restarts += 1
+        if restarts >= max_restarts:
+            break
+        
+        if restarts <= in_place_attempts:
+            # 清理登录状态后原地重新打开
+            try:
+                driver.delete_all_cookies()
+                driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+            except:
+                pass
+        else:
+            # 静默重启浏览器，复用同一个用户数据目录
+            try:
+                driver.quit()
+            except:
+                pass
+            driver, user_data_dir = _build_driver(user_data_dir)
     
-    return False
+    log(f"账号 {account_index} - ? 重试{max_restarts}次后仍无法进入登录页面: {last_error}")
+    return False, driver
+
+def _find_password_error(driver):
+    """一次脚本调用检查页面可见文本中是否包含错误提示关键字，返回命中的关键字"""
+    return driver.execute_script("""
+        var keywords = arguments[0];
+        var text = document.body ? document.body.innerText : '';
+        for (var i = 0; i < keywords.length; i++) {
+            if (text.indexOf(keywords[i]) >= 0) return keywords[i];
+        }
+        return null;
+    """, ['账号或密码不正确', '用户名或密码错误', '密码错误', '登录失败'])
+
+def wait_login_feedback(driver, ready_condition, timeout=1):
+    """等待错误提示或下一步页面状态出现（最多 timeout 秒），代替固定等待"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: ready_condition(d) or _find_password_error(d)
+        )
+    except TimeoutException:
+        pass
 
 def check_password_error(driver, account_index):
     """检查页面是否显示密码错误提示"""
     try:
-        # 等待可能出现的错误提示元素
-        error_selectors = [
-            "//*[contains(text(), '账号或密码不正确')]",
-            "//*[contains(text(), '用户名或密码错误')]",
-            "//*[contains(text(), '密码错误')]",
-            "//*[contains(text(), '登录失败')]",
-            "//*[contains(@class, 'error')]",
-            "//*[contains(@class, 'err-msg')]",
-            "//*[contains(@class, 'toast')]",
-            "//*[contains(@class, 'message')]"
-        ]
-        
-        for selector in error_selectors:
-            try:
-                # 使用短暂的等待来检查错误提示
-                error_element = WebDriverWait(driver, 2).until(
-                    EC.presence_of_element_located((By.XPATH, selector))
-                )
-                if error_element.is_displayed():
-                    error_text = error_element.text.strip()
-                    if any(keyword in error_text for keyword in ['账号或密码不正确', '用户名或密码错误', '密码错误', '登录失败']):
-                        log(f"账号 {account_index} - ? 检测到账号或密码错误，跳过此账号")
-                        return True
-            except:
-                continue
+        keyword = _find_password_error(driver)
+        if keyword:
+            log(f"账号 {account_index} - ? 检测到账号或密码错误，跳过此账号")
+            return True
                 
         return False
     except Exception as e:
         log(f"账号 {account_index} - ? 检查密码错误时出现异常: {e}")
         return False
 
-def sign_in_account(username, password, account_index, total_accounts, retry_count=0, is_final_retry=False):
-    """为单个账号执行完整的签到流程（包含重试机制）"""
+def new_browser():
+    """启动浏览器，返回可在多次尝试间共享的 {'driver', 'user_data_dir', 'uses'}"""
+    driver, user_data_dir = _build_driver()
+    return {'driver': driver, 'user_data_dir': user_data_dir, 'uses': 0}
+
+def _switch_to_new_tab(driver, context_id=None):
+    """新建空白标签页（可指定浏览器上下文）并切换过去，关闭旧标签页；sessionStorage 按标签页隔离，随旧标签页一起丢弃"""
+    params = {'url': 'about:blank'}
+    if context_id:
+        params['browserContextId'] = context_id
+    target_id = driver.execute_cdp_cmd('Target.createTarget', params)['targetId']
+    new_handle = next(h for h in driver.window_handles if target_id in h)
+    
+    driver.close()  # 关闭旧窗口
+    driver.switch_to.window(new_handle)
+
+def _switch_to_fresh_context(browser):
+    """在同一个 Chrome 进程中新建隔离的浏览器上下文（类似无痕窗口）并切换过去，随后销毁旧上下文"""
+    driver = browser['driver']
+    context_id = driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+    _switch_to_new_tab(driver, context_id)
+    old_context_id = browser.get('context_id')
+    browser['context_id'] = context_id
+    if old_context_id:
+        driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': old_context_id})
+    
+    _prepare_page_target(driver)
+    driver.get_log('performance')  # 丢弃旧窗口遗留的日志
+
+def reset_browser(browser):
+    """为下一次尝试提供干净的浏览器状态：优先切换到新的隔离上下文，否则清空 Cookie 和站点数据；都失败时重启浏览器"""
+    driver = browser['driver']
+    # 清除按浏览器缓存的上一个账号的 Cookie 串和用户信息
+    _oshwhub_cookie_cache.pop(driver, None)
+    _oshwhub_user_cache.pop(driver, None)
+    try:
+        _switch_to_fresh_context(browser)
+        return
+    except Exception as e:
+        log(f"? 切换到新的浏览器上下文失败，改为清空站点数据并换用新标签页: {e}")
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for origin in SITE_ORIGINS:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        # clearDataForOrigin 不会清理 sessionStorage（其中有上一个账号的 token 和 secretkey），换用新标签页
+        _switch_to_new_tab(driver, browser.get('context_id'))
+        _prepare_page_target(driver)
+        driver.get_log('performance')  # 丢弃旧窗口遗留的日志
+    except Exception as e:
+        log(f"? 清理浏览器状态失败，重启浏览器: {e}")
+        try:
+            driver.quit()
+        except:
+            pass
+        browser['driver'], browser['user_data_dir'] = _build_driver(browser['user_data_dir'])
+        browser['context_id'] = None
+
+class BrowserPool:
+    """跨账号复用浏览器：取出时清空站点数据，使用次数达到上限后关闭"""
+    
+    def __init__(self, max_uses=MAX_USES_PER_BROWSER):
+        self.max_uses = max_uses
+        self._idle = queue.Queue()
+        self._spawning = []  # 后台预启动中的浏览器，关闭浏览器池前需等待完成
+        # 预启动使用独立线程，冷启动 Chrome 不会挡住后台接口查询
+        self._spawn_executor = ThreadPoolExecutor(max_workers=1)
+    
+    def acquire(self):
+        """取出一个空闲浏览器（清理后返回），没有空闲时启动新浏览器"""
+        try:
+            browser = self._idle.get_nowait()
+        except queue.Empty:
+            browser = new_browser()
+        else:
+            reset_browser(browser)
+        browser['uses'] += 1
+        return browser
+    
+    def release(self, browser):
+        """归还浏览器；达到使用上限的关闭，并在后台预先启动替换的浏览器，下一个账号无需等待冷启动"""
+        if browser['uses'] >= self.max_uses:
+            try:
+                browser['driver'].quit()
+            except Exception as e:
+                log(f"? 关闭浏览器失败: {e}")
+            self._spawning.append(self._spawn_executor.submit(self._spawn_idle))
+        else:
+            self._idle.put(browser)
+    
+    def _spawn_idle(self):
+        try:
+            self._idle.put(new_browser())
+        except Exception as e:
+            log(f"? 预启动浏览器失败: {e}")
+    
+    def close(self):
+        """关闭所有空闲浏览器：尚未开始的预启动直接取消，已开始的等待完成，避免遗留 Chrome 进程"""
+        for future in self._spawning:
+            if not future.cancel():
+                future.result()
+        self._spawn_executor.shutdown()
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                browser['driver'].quit()
+            except:
+                pass
+
+# 与浏览器操作重叠执行的后台接口查询（如签到后积分）
+_background_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# 池中浏览器数量受并发账号数自然限制（每个工作线程同一时间只持有一个）
+browser_pool = BrowserPool()
+
+def sign_in_account(username, password, account_index, total_accounts, retry_count=0, is_final_retry=False, browser=None):
+    """为单个账号执行完整的签到流程（包含重试机制）
+
+    传入 browser 时复用该浏览器（由调用方负责关闭），否则启动新浏览器并在结束时关闭
+    """
     retry_label = ""
     if retry_count > 0:
         retry_label = f" (重试{retry_count})"
@@ -652,25 +1286,10 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
     
     log(f"开始处理账号 {account_index}/{total_accounts}{retry_label}")
     
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument(f"--user-data-dir={tempfile.mkdtemp()}")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # 禁用图像加载
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-
-    caps = DesiredCapabilities.CHROME
-    caps['goog:loggingPrefs'] = {'performance': 'ALL'}
-    
-    driver = webdriver.Chrome(options=chrome_options, desired_capabilities=caps)
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    
-    wait = WebDriverWait(driver, 25)
+    owns_browser = browser is None
+    if owns_browser:
+        browser = new_browser()
+    driver = browser['driver']
     
     # 记录详细结果
     result = {
@@ -690,146 +1309,164 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
         'has_jindou_reward': False,  # 金豆是否有额外奖励
         'token_extracted': False,
         'secretkey_extracted': False,
+        'access_token': None,     # 提取到的 token，供金豆单独重试使用
+        'secretkey': None,
         'retry_count': retry_count,
         'is_final_retry': is_final_retry,
         'password_error': False  #标记密码错误
     }
 
     try:
-        # 1. 确保进入登录页面
-        if not ensure_login_page(driver, account_index):
-            result['oshwhub_status'] = '无法进入登录页'
-            return result
+        # 0. 优先使用缓存的登录状态，有效时跳过登录页、账号密码和滑块验证
+        session_restored = restore_login_session(driver, username, account_index)
+        
+        if not session_restored:
+            # 1. 确保进入登录页面（期间可能重启浏览器，使用返回的 driver）
+            on_login_page, driver = ensure_login_page(driver, account_index, browser['user_data_dir'])
+            if driver is not browser['driver']:
+                browser['driver'], browser['context_id'] = driver, None  # 浏览器已重启，旧上下文随之失效
+            if not on_login_page:
+                result['oshwhub_status'] = '无法进入登录页'
+                return result
 
-        current_url = driver.current_url
+            # 登录表单元素通常 1 秒内出现，使用较短超时和更高的轮询频率
+            wait = WebDriverWait(driver, 10, poll_frequency=0.1,
+                                 ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
 
-        # 2. 登录流程
-        log(f"账号 {account_index} - 检测到未登录状态，正在执行登录流程...")
+            # 2. 登录流程
+            log(f"账号 {account_index} - 检测到未登录状态，正在执行登录流程...")
 
-        try:
-            phone_btn = wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//button[contains(text(),"账号登录")]'))
-            )
-            phone_btn.click()
-            log(f"账号 {account_index} - 已切换账号登录")
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, '//input[@placeholder="请输入手机号码 / 客户编号 / 邮箱"]')))
-        except Exception as e:
-            log(f"账号 {account_index} - 账号登录按钮可能已默认选中: {e}")
+            try:
+                phone_btn = wait.until(
+                    EC.element_to_be_clickable(ACCOUNT_LOGIN_BTN_LOC)
+                )
+                phone_btn.click()
+                log(f"账号 {account_index} - 已切换账号登录")
+            except Exception as e:
+                log(f"账号 {account_index} - 账号登录按钮可能已默认选中: {e}")
 
-        # 输入账号密码
-        try:
-            user_input = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@placeholder="请输入手机号码 / 客户编号 / 邮箱"]'))
-            )
-            user_input.clear()
-            user_input.send_keys(username)
-
-            pwd_input = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@type="password"]'))
-            )
-            pwd_input.clear()
-            pwd_input.send_keys(password)
-            log(f"账号 {account_index} - 已输入账号密码")
-        except Exception as e:
-            log(f"账号 {account_index} - ? 登录输入框未找到: {e}")
-            result['oshwhub_status'] = '登录失败'
-            return result
+            # 输入账号密码
+            try:
+                user_input = wait.until(
+                    EC.presence_of_element_located(USERNAME_INPUT_LOC)
+                )
+                pwd_input = wait.until(
+                    EC.presence_of_element_located(PASSWORD_INPUT_LOC)
+                )
 
-        # 点击登录
-        try:
-            login_btn = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.submit"))
-            )
-            login_btn.click()
-            log(f"账号 {account_index} - 已点击登录按钮")
-        except Exception as e:
-            log(f"账号 {account_index} - ? 登录按钮定位失败: {e}")
-            result['oshwhub_status'] = '登录失败'
-            return result
-
-        # 立即检查密码错误提示（点击登录按钮后）
-        time.sleep(1)  # 给错误提示一点时间显示
-        if check_password_error(driver, account_index):
-            result['password_error'] = True
-            result['oshwhub_status'] = '密码错误'
-            return result
-
-        # 处理滑块验证
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, ".btn_slide")))
-        try:
-            slider = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, ".btn_slide"))
-            )
+                # 一次脚本调用填入账号密码：使用原生 value setter 并派发 input/change 事件，保证前端框架能感知
+                driver.execute_script("""
+                    var setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+                    function fill(el, value) {
+                        el.focus();
+                        setValue.call(el, value);
+                        el.dispatchEvent(new Event('input', {bubbles: true}));
+                        el.dispatchEvent(new Event('change', {bubbles: true}));
+                    }
+                    fill(arguments[0], arguments[1]);
+                    fill(arguments[2], arguments[3]);
+                """, user_input, username, pwd_input, password)
+                log(f"账号 {account_index} - 已输入账号密码")
+            except Exception as e:
+                log(f"账号 {account_index} - ? 登录输入框未找到: {e}")
+                result['oshwhub_status'] = '登录失败'
+                return result
+
+            # 点击登录
+            try:
+                login_btn = wait.until(
+                    EC.element_to_be_clickable(LOGIN_SUBMIT_LOC)
+                )
+                login_btn.click()
+                log(f"账号 {account_index} - 已点击登录按钮")
+            except Exception as e:
+                log(f"账号 {account_index} - ? 登录按钮定位失败: {e}")
+                result['oshwhub_status'] = '登录失败'
+                return result
+
+            # 立即检查密码错误提示（点击登录按钮后）：滑块或错误提示先出现即停止等待
+            wait_login_feedback(driver, lambda d: d.find_elements(*SLIDER_BTN_LOC))
+            if check_password_error(driver, account_index):
+                result['password_error'] = True
+                result['oshwhub_status'] = '密码错误'
+                return result
+
+            # 处理滑块验证
+            # 提交后等待滑块加载是唯一需要较长超时的步骤
+            WebDriverWait(driver, 25).until(EC.presence_of_element_located(SLIDER_BTN_LOC))
+            try:
+                slider = wait.until(
+                    EC.element_to_be_clickable(SLIDER_BTN_LOC)
+                )
             
-            track = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".nc_scale"))
-            )
+                track = wait.until(
+                    EC.presence_of_element_located(SLIDER_TRACK_LOC)
+                )
             
-            track_width = track.size['width']
-            slider_width = slider.size['width']
-            move_distance = track_width - slider_width - 10
+                # 一次脚本调用同时取得滑块位置和轨道宽度，整个拖动轨迹据此一次算出
+                rect, track_width = driver.execute_script(
+                    "return [arguments[0].getBoundingClientRect().toJSON(), arguments[1].getBoundingClientRect().width];",
+                    slider, track
+                )
+                move_distance = int(track_width - rect['width'] - 10)
             
-            log(f"账号 {account_index} - 检测到滑块验证码，滑动距离: {move_distance}px")
+                log(f"账号 {account_index} - 检测到滑块验证码，滑动距离: {move_distance}px")
             
-            actions = ActionChains(driver)
-            actions.click_and_hold(slider).perform()
-            time.sleep(0.5)
+                # 通过 CDP 直接派发鼠标事件，避免 ActionChains 每次移动附带的 250ms 动作时长
+                x = rect['x'] + rect['width'] / 2
+                y = rect['y'] + rect['height'] / 2
             
-            quick_distance = int(move_distance * random.uniform(0.6, 0.8))
-            slow_distance = move_distance - quick_distance
+                def mouse_event(event_type, mouse_x, mouse_y, buttons=1):
+                    params = {'type': event_type, 'x': mouse_x, 'y': mouse_y, 'button': 'left', 'buttons': buttons}
+                    if event_type != 'mouseMoved':
+                        params['clickCount'] = 1
+                    driver.execute_cdp_cmd('Input.dispatchMouseEvent', params)
             
-            y_offset1 = random.randint(-2, 2)
-            actions.move_by_offset(quick_distance, y_offset1).perform()
-            time.sleep(random.uniform(0.1, 0.3))
+                mouse_event('mouseMoved', x, y, buttons=0)
+                mouse_event('mousePressed', x, y)
+                time.sleep(0.5)
             
-            y_offset2 = random.randint(-2, 2)
-            actions.move_by_offset(slow_distance, y_offset2).perform()
-            time.sleep(random.uniform(0.05, 0.15))
+                quick_distance = int(move_distance * random.uniform(0.6, 0.8))
+                slow_distance = move_distance - quick_distance
             
-            actions.release().perform()
-            log(f"账号 {account_index} - 滑块拖动完成")
+                x += quick_distance
+                y += random.randint(-2, 2)
+                mouse_event('mouseMoved', x, y)
+                time.sleep(random.uniform(0.1, 0.3))
             
-            # 滑块验证后立即检查密码错误提示
-            time.sleep(1)  # 给错误提示一点时间显示
-            if check_password_error(driver, account_index):
-                result['password_error'] = True
-                result['oshwhub_status'] = '密码错误'
-                return result
-                
-            WebDriverWait(driver, 10).until(lambda d: "oshwhub.com" in d.current_url and "passport.jlc.com" not in d.current_url)
+                x += slow_distance
+                y += random.randint(-2, 2)
+                mouse_event('mouseMoved', x, y)
+                time.sleep(random.uniform(0.05, 0.15))
             
-        except Exception as e:
-            log(f"账号 {account_index} - 滑块验证处理: {e}")
-            # 滑块验证失败后检查密码错误
-            time.sleep(1)
+                mouse_event('mouseReleased', x, y)
+                log(f"账号 {account_index} - 滑块拖动完成")
+            
+            except Exception as e:
+                log(f"账号 {account_index} - 滑块验证处理: {e}")
+
+            # 无论滑块是否成功，都只检查一次密码错误提示：已跳转或出现错误提示即停止等待
+            wait_login_feedback(driver, _is_login_redirected)
             if check_password_error(driver, account_index):
                 result['password_error'] = True
                 result['oshwhub_status'] = '密码错误'
                 return result
 
-        # 等待跳转
-        log(f"账号 {account_index} - 等待登录跳转...")
-        max_wait = 15
-        jumped = False
-        for i in range(max_wait):
-            current_url = driver.current_url
-            
-            # 检查是否成功跳转回签到页面
-            if "oshwhub.com" in current_url and "passport.jlc.com" not in current_url:
+            # 等待跳转
+            log(f"账号 {account_index} - 等待登录跳转...")
+            try:
+                # 检查是否成功跳转回签到页面
+                wait_login_redirect(driver, 15)
                 log(f"账号 {account_index} - 成功跳转回签到页面")
-                jumped = True
-                break
+            except TimeoutException:
+                current_title = driver.title
+                log(f"账号 {account_index} - ? 跳转超时，当前页面标题: {current_title}")
+                result['oshwhub_status'] = '跳转失败'
+                return result
             
-            time.sleep(1)
-        
-        if not jumped:
-            current_title = driver.title
-            log(f"账号 {account_index} - ? 跳转超时，当前页面标题: {current_title}")
-            result['oshwhub_status'] = '跳转失败'
-            return result
-
-        # 3. 获取用户昵称
-        time.sleep(1)
+            save_login_session(driver, username)
+
+        # 3. 获取用户昵称（接口失败时由 with_retry 退避重试，无需预先等待）
         nickname = get_user_nickname_from_api(driver, account_index)
         if nickname:
             result['nickname'] = nickname
@@ -843,19 +1480,22 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
 
         # 5. 开源平台签到
         log(f"账号 {account_index} - 正在签到中...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
         try:
             driver.refresh()
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            # 等待"立即签到"或"已签到"任一出现，说明签到区域已渲染完成
+            WebDriverWait(driver, 10).until(lambda d: d.find_elements(*SIGN_STATE_LOC))
         except:
             pass
-        time.sleep(6)
+        # 签到步骤内的各次等待共用一个短超时、快轮询的实例，状态未出现时尽快进入下一轮
+        short_wait = WebDriverWait(driver, 5, poll_frequency=0.2,
+                                   ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
         # 执行开源平台签到
         try:
             # 先检查是否已经签到
-            try:
-                signed_element = driver.find_element(By.XPATH, '//span[contains(text(),"已签到")]')
+            # 未签到时探测脚本会顺带点击签到按钮，省去单独查找和点击的往返
+            page_state = probe_sign_page(driver, click_sign_btn=True)
+            if page_state['signed']:
                 log(f"账号 {account_index} - ? 今天已经在开源平台签到过了！")
                 result['oshwhub_status'] = '已签到过'
                 result['oshwhub_success'] = True
@@ -863,37 +1503,54 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
                 # 即使已签到，也尝试点击礼包按钮
                 result['reward_results'] = click_gift_buttons(driver, account_index)
                 
-            except:
+            else:
+                if not page_state['sign_btn']:
+                    log(f"账号 {account_index} - 暂未检测到签到按钮，等待页面加载...")
                 # 如果没有找到"已签到"元素，则尝试点击"立即签到"按钮，并验证是否变为"已签到"
                 signed = False
+                if page_state['clicked']:
+                    # 页面通常会原地更新，等待成功提示或"已签到"出现
+                    try:
+                        short_wait.until(sign_confirmed())
+                        signed = True
+                    except TimeoutException:
+                        pass  # 交由下方的点击重试
                 max_attempts = 5
                 for attempt in range(max_attempts):
+                    if signed:
+                        break
                     try:
-                        sign_btn = wait.until(
-                            EC.element_to_be_clickable((By.XPATH, '//span[contains(text(),"立即签到")]'))
-                        )
+                        # 同一轮轮询中等待"已签到"或可点击的"立即签到"，已签到时不必耗尽超时
+                        sign_btn = short_wait.until(any_of(
+                            EC.presence_of_element_located(SIGNED_LOC),
+                            EC.element_to_be_clickable(SIGN_BTN_LOC)
+                        ))
+                        if "已签到" in sign_btn.text:
+                            signed = True
+                            break
                         sign_btn.click()
-                        time.sleep(2)  # 等待页面更新
-                        driver.refresh()  # 刷新页面以确保状态更新
-                        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                        time.sleep(2)  # 额外等待
 
-                        # 检查是否变为"已签到"
-                        signed_element = driver.find_element(By.XPATH, '//span[contains(text(),"已签到")]')
+                        # 页面通常会原地更新，等待成功提示或"已签到"出现
+                        short_wait.until(sign_confirmed())
                         signed = True
                         break  # 成功，退出循环
                     except:
-                        pass  # 静默继续下一次尝试
+                        # 未检测到状态变化时刷新页面再确认一次，任一状态渲染出来即可判断
+                        try:
+                            driver.refresh()
+                            state_el = short_wait.until(EC.presence_of_element_located(SIGN_STATE_LOC))
+                            if "已签到" in state_el.text:
+                                signed = True
+                                break
+                        except:
+                            pass  # 静默继续下一次尝试
 
                 if signed:
                     log(f"账号 {account_index} - ? 开源平台签到成功！")
                     result['oshwhub_status'] = '签到成功'
                     result['oshwhub_success'] = True
                     
-                    # 等待签到完成
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    
-                    # 6. 签到完成后点击7天好礼和月度好礼
+                    # 6. 签到完成后点击7天好礼和月度好礼（非礼包日直接返回，页面就绪等待只在需要点击时进行）
                     result['reward_results'] = click_gift_buttons(driver, account_index)
                 else:
                     log(f"账号 {account_index} - ? 开源平台签到失败")
@@ -903,38 +1560,50 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
             log(f"账号 {account_index} - ? 开源平台签到异常: {e}")
             result['oshwhub_status'] = '签到异常'
 
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-        # 7. 获取签到后积分数量
-        final_points = get_oshwhub_points(driver, account_index)
-        result['final_points'] = final_points if final_points is not None else 0
-        log(f"账号 {account_index} - 签到后积分??: {result['final_points']}")
+        if session_restored and not result['oshwhub_success']:
+            # 恢复的会话可能只是部分有效，下次改为完整登录
+            drop_login_session(username)
 
-        # 8. 计算积分差值
-        result['points_reward'] = result['final_points'] - result['initial_points']
-        if result['points_reward'] > 0:
-            log(f"账号 {account_index} - ?? 总积分增加: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
-        elif result['points_reward'] == 0:
-            log(f"账号 {account_index} - ? 总积分无变化，可能今天已签到过: {result['initial_points']} → {result['final_points']} (0)")
+        # 7. 获取签到后积分数量：已有通过认证的 Cookie 时只需调用接口，放到后台线程与下方 m.jlc.com 的页面加载重叠
+        cookie_str = _oshwhub_cookie_cache.get(driver)
+        if cookie_str is not None:
+            final_points_future = _background_executor.submit(fetch_oshwhub_points_by_cookie, cookie_str)
         else:
-            log(f"账号 {account_index} - ? 积分减少: {result['initial_points']} → {result['final_points']} ({result['points_reward']})")
+            final_points_future = None
+            record_final_points(result, get_oshwhub_points(driver, account_index), account_index)
 
         # 9. 金豆签到流程
         log(f"账号 {account_index} - 开始金豆签到流程...")
-        driver.get("https://m.jlc.com/")
-        log(f"账号 {account_index} - 已访问 m.jlc.com，等待页面加载...")
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        
-        navigate_and_interact_m_jlc(driver, account_index)
+        # 缓存的凭据仍然有效时跳过 m.jlc.com 页面加载和抓取
+        cached = load_cached_credentials(username)
+        if cached and JLCClient(*cached, account_index, None).get_user_info():
+            log(f"账号 {account_index} - 使用缓存的 token 和 secretkey")
+            access_token, secretkey = cached
+        else:
+            driver.get("https://m.jlc.com/")
+            log(f"账号 {account_index} - 已访问 m.jlc.com，等待页面加载...")
+            
+            # navigate_and_interact_m_jlc 开始时会等待页面加载完成
+            navigate_and_interact_m_jlc(driver, account_index)
+            
+            access_token, secretkey = extract_credentials(driver)
+            if access_token and secretkey:
+                save_cached_credentials(username, access_token, secretkey)
         
-        access_token = extract_token_from_local_storage(driver)
-        secretkey = extract_secretkey_from_devtools(driver)
+        if final_points_future is not None:
+            final_points = final_points_future.result()
+            if final_points is None:
+                log(f"账号 {account_index} - ? 无法获取积分信息")
+            record_final_points(result, final_points, account_index)
         
         result['token_extracted'] = bool(access_token)
         result['secretkey_extracted'] = bool(secretkey)
+        result['access_token'] = access_token
+        result['secretkey'] = secretkey
         
         if access_token and secretkey:
             log(f"账号 {account_index} - ? 成功提取 token 和 secretkey")
+            stop_performance_logging(driver)
             
             jlc_client = JLCClient(access_token, secretkey, account_index, driver)
             jindou_success = jlc_client.execute_full_process()
@@ -959,15 +1628,87 @@ def sign_in_account(username, password, account_index, total_accounts, retry_cou
         log(f"账号 {account_index} - ? 程序执行错误: {e}")
         result['oshwhub_status'] = '执行异常'
     finally:
-        driver.quit()
-        log(f"账号 {account_index} - 浏览器已关闭")
+        if owns_browser:
+            driver.quit()
+            log(f"账号 {account_index} - 浏览器已关闭")
     
     return result
 
-def should_retry(merged_success, password_error):
-    """判断是否需要重试：如果开源平台或金豆签到未成功，且不是密码错误"""
-    need_retry = (not merged_success['oshwhub'] or not merged_success['jindou']) and not password_error
-    return need_retry
+# 开源平台和金豆各自的结果字段，合并多次尝试的结果时整体复制
+OSHWHUB_RESULT_KEYS = ('oshwhub_status', 'initial_points', 'final_points', 'points_reward', 'reward_results')
+JINDOU_RESULT_KEYS = ('jindou_status', 'initial_jindou', 'final_jindou', 'jindou_reward', 'has_jindou_reward')
+
+def merge_if_success(dst, src, flag_key, keys):
+    """如果 src 本次成功且 dst 之前未成功，则复制 keys 对应的字段，返回是否发生了合并"""
+    if src[flag_key] and not dst[flag_key]:
+        dst.update({k: src[k] for k in keys})
+        dst[flag_key] = True
+        return True
+    return False
+
+def merge_extra_fields(dst, src):
+    """合并昵称、token/secretkey 提取情况等附加信息（如果之前未知）"""
+    if dst['nickname'] == '未知' and src['nickname'] != '未知':
+        dst['nickname'] = src['nickname']
+    
+    if src['token_extracted']:
+        dst['token_extracted'] = True
+    
+    if src['secretkey_extracted']:
+        dst['secretkey_extracted'] = True
+    
+    if src.get('access_token') and src.get('secretkey'):
+        dst['access_token'] = src['access_token']
+        dst['secretkey'] = src['secretkey']
+
+def mark_failed(result):
+    """计算并缓存账号是否失败（任一签到失败且非密码错误），返回该标记"""
+    result['failed'] = (not result['oshwhub_success'] or not result['jindou_success']) and not result.get('password_error', False)
+    return result['failed']
+
+# 已登录并在页面内多次尝试后仍失败的开源平台状态，重新登录通常也无法恢复，不再为其完整重试
+OSHWHUB_PERMANENT_STATUSES = frozenset({'签到失败'})
+
+def should_retry(result, has_credentials=False, last_oshwhub_status=None):
+    """判断是否需要重试，返回重试方式：None-无需重试，'full'-完整重试，'jindou_only'-只重试金豆签到
+
+    开源平台已成功（或本次为永久性失败）且已有 token 和 secretkey 时，只需直接调用金豆接口，无需重新登录
+    """
+    oshwhub_done = result['oshwhub_success'] or last_oshwhub_status in OSHWHUB_PERMANENT_STATUSES
+    if result['password_error'] or (oshwhub_done and result['jindou_success']):
+        return None
+    if oshwhub_done and has_credentials:
+        return 'jindou_only'
+    return 'full'
+
+def sign_in_jindou_only(access_token, secretkey, account_index, retry_count=0):
+    """使用已提取的 token 和 secretkey 直接执行金豆签到，不启动浏览器"""
+    log(f"账号 {account_index} - 使用已提取的 token 和 secretkey 重试金豆签到")
+    jlc_client = JLCClient(access_token, secretkey, account_index, None)
+    jindou_success = jlc_client.execute_full_process()
+    return {
+        'account_index': account_index,
+        'nickname': '未知',
+        'oshwhub_status': '未知',
+        'oshwhub_success': False,
+        'initial_points': 0,
+        'final_points': 0,
+        'points_reward': 0,
+        'reward_results': [],
+        'jindou_status': jlc_client.sign_status,
+        'jindou_success': jindou_success,
+        'initial_jindou': jlc_client.initial_jindou,
+        'final_jindou': jlc_client.final_jindou,
+        'jindou_reward': jlc_client.jindou_reward,
+        'has_jindou_reward': jlc_client.has_reward,
+        'token_extracted': True,
+        'secretkey_extracted': True,
+        'access_token': access_token,
+        'secretkey': secretkey,
+        'retry_count': retry_count,
+        'is_final_retry': False,
+        'password_error': False
+    }
 
 def process_single_account(username, password, account_index, total_accounts):
     """处理单个账号，包含重试机制，并合并多次尝试的最佳结果"""
@@ -989,84 +1730,106 @@ def process_single_account(username, password, account_index, total_accounts):
         'has_jindou_reward': False,
         'token_extracted': False,
         'secretkey_extracted': False,
+        'access_token': None,
+        'secretkey': None,
         'retry_count': 0,  # 记录最后使用的retry_count
         'is_final_retry': False,
-        'password_error': False  # 标记密码错误
+        'password_error': False,  # 标记密码错误
+        'failed': False  # 缓存的失败标记，由 mark_failed 计算
     }
     
-    merged_success = {'oshwhub': False, 'jindou': False}
+    retry_mode = 'full'
+    consecutive_failures = 0  # 连续无进展的尝试次数，决定重试前的退避时长
+    last_oshwhub_status = None  # 最近一次完整尝试的开源平台状态，用于区分暂时性和永久性失败
+    browser = None  # 同一账号的多次尝试共用一个浏览器，避免反复冷启动
 
-    for attempt in range(max_retries + 1):  # 第一次执行 + 重试次数
-        result = sign_in_account(username, password, account_index, total_accounts, retry_count=attempt)
-        
-        # 如果检测到密码错误，立即停止重试
-        if result.get('password_error'):
-            merged_result['password_error'] = True
-            merged_result['oshwhub_status'] = '密码错误'
-            merged_result['nickname'] = '未知'
-            break
-        
-        # 合并开源平台结果：如果本次成功且之前未成功，则更新
-        if result['oshwhub_success'] and not merged_success['oshwhub']:
-            merged_success['oshwhub'] = True
-            merged_result['oshwhub_status'] = result['oshwhub_status']
-            merged_result['initial_points'] = result['initial_points']
-            merged_result['final_points'] = result['final_points']
-            merged_result['points_reward'] = result['points_reward']
-            merged_result['reward_results'] = result['reward_results']  # 合并礼包结果
-        
-        # 合并金豆结果：如果本次成功且之前未成功，则更新
-        if result['jindou_success'] and not merged_success['jindou']:
-            merged_success['jindou'] = True
-            merged_result['jindou_status'] = result['jindou_status']
-            merged_result['initial_jindou'] = result['initial_jindou']
-            merged_result['final_jindou'] = result['final_jindou']
-            merged_result['jindou_reward'] = result['jindou_reward']
-            merged_result['has_jindou_reward'] = result['has_jindou_reward']
+    try:
+        for attempt in range(max_retries + 1):  # 第一次执行 + 重试次数
+            if retry_mode == 'jindou_only':
+                result = sign_in_jindou_only(merged_result['access_token'], merged_result['secretkey'],
+                                             account_index, retry_count=attempt)
+            else:
+                if browser is None:
+                    browser = browser_pool.acquire()
+                else:
+                    reset_browser(browser)
+                result = sign_in_account(username, password, account_index, total_accounts,
+                                         retry_count=attempt, browser=browser)
         
-        # 更新其他字段（如果之前未知）
-        if merged_result['nickname'] == '未知' and result['nickname'] != '未知':
-            merged_result['nickname'] = result['nickname']
+            # 如果检测到密码错误，立即停止重试
+            if result.get('password_error'):
+                merged_result['password_error'] = True
+                merged_result['oshwhub_status'] = '密码错误'
+                merged_result['nickname'] = '未知'
+                break
         
-        if not merged_result['token_extracted'] and result['token_extracted']:
-            merged_result['token_extracted'] = result['token_extracted']
+            # 合并开源平台和金豆结果：如果本次成功且之前未成功，则更新
+            oshwhub_progress = merge_if_success(merged_result, result, 'oshwhub_success', OSHWHUB_RESULT_KEYS)
+            jindou_progress = merge_if_success(merged_result, result, 'jindou_success', JINDOU_RESULT_KEYS)
+            merge_extra_fields(merged_result, result)
         
-        if not merged_result['secretkey_extracted'] and result['secretkey_extracted']:
-            merged_result['secretkey_extracted'] = result['secretkey_extracted']
+            # 本次有新的签到成功则清零连续失败计数，否则累加用于退避
+            if oshwhub_progress or jindou_progress:
+                consecutive_failures = 0
+            else:
+                consecutive_failures += 1
         
-        # 更新retry_count为最后一次尝试的
-        merged_result['retry_count'] = result['retry_count']
+            # 更新retry_count为最后一次尝试的
+            merged_result['retry_count'] = result['retry_count']
+            if retry_mode == 'full':
+                last_oshwhub_status = result['oshwhub_status']  # 金豆单独重试不涉及开源平台，保留完整尝试的状态
+                if not merged_result['oshwhub_success']:
+                    merged_result['oshwhub_status'] = last_oshwhub_status  # 记录失败原因，供最终重试判断是否为永久性失败
         
-        # 检查是否还需要重试（排除密码错误的情况）
-        if not should_retry(merged_success, merged_result['password_error']) or attempt >= max_retries:
-            break
-        else:
-            log(f"账号 {account_index} - ?? 准备第 {attempt + 1} 次重试，等待 {random.randint(2, 6)} 秒后重新开始...")
-            time.sleep(random.randint(2, 6))
-    
-    # 最终设置success字段基于合并
-    merged_result['oshwhub_success'] = merged_success['oshwhub']
-    merged_result['jindou_success'] = merged_success['jindou']
+            # 检查是否还需要重试（排除密码错误的情况）
+            # 金豆单独重试失败时，token 可能已失效，下一次改为完整重试以重新提取
+            has_credentials = bool(merged_result['access_token'] and merged_result['secretkey']) and retry_mode != 'jindou_only'
+            retry_mode = should_retry(merged_result, has_credentials, last_oshwhub_status)
+            if not retry_mode or attempt >= max_retries:
+                break
+            elif consecutive_failures:
+                # 仅在上一次尝试完全失败时按指数退避等待，保留少量抖动
+                wait_time = failure_backoff(consecutive_failures)
+                log(f"账号 {account_index} - ?? 准备第 {attempt + 1} 次重试，等待 {wait_time:.1f} 秒后重新开始...")
+                time.sleep(wait_time)
+            else:
+                log(f"账号 {account_index} - ?? 上次尝试部分成功，立即开始第 {attempt + 1} 次重试...")
+    except Exception as e:
+        # 启动或清理浏览器失败等异常只记为该账号失败，不中断其他账号，交由最终重试处理
+        log(f"账号 {account_index} - ? 处理账号时出错: {e}")
+        if not merged_result['oshwhub_success']:
+            merged_result['oshwhub_status'] = '执行异常'
+    finally:
+        if browser is not None:
+            browser_pool.release(browser)
+            log(f"账号 {account_index} - 浏览器已归还")
     
+    mark_failed(merged_result)
     return merged_result
 
-def execute_final_retry_for_failed_accounts(all_results, usernames, passwords, total_accounts):
-    """对失败的账号执行最终重试（排除密码错误的账号）"""
+def execute_final_retry_for_failed_accounts(all_results, failed_results, usernames, passwords, total_accounts):
+    """对失败的账号执行最终重试（failed_results 为 main 中已筛出的失败结果，已排除密码错误的账号）"""
     log("=" * 70)
     log("?? 执行最终重试 - 处理所有重试后仍失败的账号")
     log("=" * 70)
     
-    # 找出需要最终重试的账号（排除密码错误的）
+    # all_results 按账号顺序排列，可直接由 account_index 定位
+    # 与账号内重试使用相同的判断：开源平台为永久性失败时不再重新登录，有凭据则只重试金豆签到
     failed_accounts = []
-    for i, result in enumerate(all_results):
-        if (not result['oshwhub_success'] or not result['jindou_success']) and not result.get('password_error', False):
-            failed_accounts.append({
-                'index': i,
-                'account_index': result['account_index'],
-                'username': usernames[result['account_index'] - 1],
-                'password': passwords[result['account_index'] - 1],
-                'previous_retry_count': result['retry_count']
-            })
+    for result in failed_results:
+        has_credentials = bool(result['access_token'] and result['secretkey'])
+        retry_mode = should_retry(result, has_credentials, result['oshwhub_status'])
+        if not retry_mode:
+            log(f"账号 {result['account_index']} - 开源平台为永久性失败（{result['oshwhub_status']}），跳过最终重试")
+            continue
+        failed_accounts.append({
+            'index': result['account_index'] - 1,
+            'account_index': result['account_index'],
+            'username': usernames[result['account_index'] - 1],
+            'password': passwords[result['account_index'] - 1],
+            'previous_retry_count': result['retry_count'],
+            'retry_mode': retry_mode
+        })
     
     if not failed_accounts:
         log("? 没有需要最终重试的账号")
@@ -1074,196 +1837,183 @@ def execute_final_retry_for_failed_accounts(all_results, usernames, passwords, t
     
     log(f"?? 需要最终重试的账号: {', '.join(str(acc['account_index']) for acc in failed_accounts)}")
     
-    # 等待一段时间再开始最终重试
-    wait_time = random.randint(2, 3)
-    log(f"? 等待 {wait_time} 秒后开始最终重试...")
+    # 这些账号刚经历失败，按失败退避等待一段时间再开始最终重试
+    wait_time = failure_backoff(1)
+    log(f"? 等待 {wait_time:.1f} 秒后开始最终重试...")
     time.sleep(wait_time)
     
-    # 执行最终重试
-    for failed_acc in failed_accounts:
+    max_workers = max(1, min(len(failed_accounts), MAX_WORKERS))
+    
+    def retry_account(position, failed_acc):
+        # 与 main 中相同：并发的首批账号错开启动
+        if position < max_workers:
+            time.sleep(position * 0.5)
         log(f"?? 开始最终重试账号 {failed_acc['account_index']}")
         
+        # 每个账号只更新 all_results 中属于自己的那一项，线程之间互不影响
+        original_result = all_results[failed_acc['index']]
+        
         # 执行最终重试（只执行一次），retry_count 设置为之前的 +1，但不超过3+1
-        final_result = sign_in_account(
-            failed_acc['username'], 
-            failed_acc['password'], 
-            failed_acc['account_index'], 
-            total_accounts, 
-            retry_count=failed_acc['previous_retry_count'] + 1,
-            is_final_retry=True
-        )
+        # 启动浏览器等异常只记为该账号重试失败，不影响其他账号和后续的总结推送
+        browser = None
+        try:
+            if failed_acc['retry_mode'] == 'jindou_only':
+                final_result = sign_in_jindou_only(original_result['access_token'], original_result['secretkey'],
+                                                   failed_acc['account_index'],
+                                                   retry_count=failed_acc['previous_retry_count'] + 1)
+            else:
+                browser = browser_pool.acquire()
+                final_result = sign_in_account(
+                    failed_acc['username'], 
+                    failed_acc['password'], 
+                    failed_acc['account_index'], 
+                    total_accounts, 
+                    retry_count=failed_acc['previous_retry_count'] + 1,
+                    is_final_retry=True,
+                    browser=browser
+                )
+        except Exception as e:
+            log(f"账号 {failed_acc['account_index']} - ? 最终重试出错: {e}")
+            original_result['is_final_retry'] = True
+            original_result['retry_count'] = failed_acc['previous_retry_count'] + 1
+            mark_failed(original_result)
+            return
+        finally:
+            if browser is not None:
+                browser_pool.release(browser)
         
         # 如果最终重试检测到密码错误，标记但不更新其他状态
         if final_result.get('password_error'):
-            original_result = all_results[failed_acc['index']]
             original_result['password_error'] = True
             original_result['oshwhub_status'] = '密码错误'
             original_result['nickname'] = '未知'
             original_result['is_final_retry'] = True
             original_result['retry_count'] = failed_acc['previous_retry_count'] + 1
+            mark_failed(original_result)
             log(f"账号 {failed_acc['account_index']} - ? 最终重试检测到密码错误")
-            continue
-        
-        original_result = all_results[failed_acc['index']]
+            return
         
-        # 更新开源平台结果
-        if final_result['oshwhub_success'] and not original_result['oshwhub_success']:
-            original_result['oshwhub_success'] = True
-            original_result['oshwhub_status'] = final_result['oshwhub_status']
-            original_result['initial_points'] = final_result['initial_points']
-            original_result['final_points'] = final_result['final_points']
-            original_result['points_reward'] = final_result['points_reward']
-            original_result['reward_results'] = final_result['reward_results']
+        # 更新开源平台和金豆结果
+        if merge_if_success(original_result, final_result, 'oshwhub_success', OSHWHUB_RESULT_KEYS):
             log(f"? 账号 {failed_acc['account_index']} - 开源平台签到成功")
         
-        # 更新金豆结果
-        if final_result['jindou_success'] and not original_result['jindou_success']:
-            original_result['jindou_success'] = True
-            original_result['jindou_status'] = final_result['jindou_status']
-            original_result['initial_jindou'] = final_result['initial_jindou']
-            original_result['final_jindou'] = final_result['final_jindou']
-            original_result['jindou_reward'] = final_result['jindou_reward']
-            original_result['has_jindou_reward'] = final_result['has_jindou_reward']
+        if merge_if_success(original_result, final_result, 'jindou_success', JINDOU_RESULT_KEYS):
             log(f"? 账号 {failed_acc['account_index']} - 金豆签到成功")
         
         # 更新其他信息
-        if original_result['nickname'] == '未知' and final_result['nickname'] != '未知':
-            original_result['nickname'] = final_result['nickname']
-        
-        if not original_result['token_extracted'] and final_result['token_extracted']:
-            original_result['token_extracted'] = final_result['token_extracted']
-        
-        if not original_result['secretkey_extracted'] and final_result['secretkey_extracted']:
-            original_result['secretkey_extracted'] = final_result['secretkey_extracted']
+        merge_extra_fields(original_result, final_result)
         
         original_result['is_final_retry'] = True
         original_result['retry_count'] = failed_acc['previous_retry_count'] + 1
-        
-        # 如果不是最后一个账号，等待一段时间
-        if failed_acc != failed_accounts[-1]:
-            wait_time = random.randint(3, 5)
-            log(f"? 等待 {wait_time} 秒后处理下一个重试账号...")
-            time.sleep(wait_time)
+        mark_failed(original_result)
+    
+    # 失败账号之间互不依赖，与首轮一样并发执行最终重试
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(retry_account, range(len(failed_accounts)), failed_accounts))
     
     log("? 最终重试完成")
     return all_results
 
-# 推送函数
-def push_summary():
-    if not summary_logs:
-        return
-    
-    title = "嘉立创签到总结"
-    text = "\n".join(summary_logs)
-    full_text = f"{title}\n{text}"  # 有些平台不需要单独标题
-    
-    # Telegram
-    telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-    telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
-    if telegram_bot_token and telegram_chat_id:
-        try:
-            url = f"https://api.telegram.org/bot{telegram_bot_token}/sendMessage"
-            params = {'chat_id': telegram_chat_id, 'text': full_text}
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                log("Telegram-日志已推送")
-        except:
-            pass  # 静默失败
+# 推送函数：每个渠道发送成功返回 True
+def _push_telegram(bot_token, chat_id, title, text, full_text):
+    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    params = {'chat_id': chat_id, 'text': full_text}
+    response = _push_session.get(url, params=params, timeout=5)
+    return response.status_code == 200
 
-    # 企业微信 (WeChat Work)
-    wechat_webhook_key = os.getenv('WECHAT_WEBHOOK_KEY')
-    if wechat_webhook_key:
-        try:
-            if wechat_webhook_key.startswith('https://'):
-                url = wechat_webhook_key
-            else:
-                url = f"https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key={wechat_webhook_key}"
-            body = {"msgtype": "text", "text": {"content": full_text}}
-            response = requests.post(url, json=body)
-            if response.status_code == 200:
-                log("企业微信-日志已推送")
-        except:
-            pass
+def _push_wechat(webhook_key, title, text, full_text):
+    if webhook_key.startswith('https://'):
+        url = webhook_key
+    else:
+        url = f"https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key={webhook_key}"
+    body = {"msgtype": "text", "text": {"content": full_text}}
+    response = _push_session.post(url, json=body, timeout=5)
+    return response.status_code == 200
 
-    # 钉钉 (DingTalk)
-    dingtalk_webhook = os.getenv('DINGTALK_WEBHOOK')
-    if dingtalk_webhook:
-        try:
-            if dingtalk_webhook.startswith('https://'):
-                url = dingtalk_webhook
-            else:
-                url = f"https://oapi.dingtalk.com/robot/send?access_token={dingtalk_webhook}"
-            body = {"msgtype": "text", "text": {"content": full_text}}
-            response = requests.post(url, json=body)
-            if response.status_code == 200:
-                log("钉钉-日志已推送")
-        except:
-            pass
+def _push_dingtalk(webhook, title, text, full_text):
+    if webhook.startswith('https://'):
+        url = webhook
+    else:
+        url = f"https://oapi.dingtalk.com/robot/send?access_token={webhook}"
+    body = {"msgtype": "text", "text": {"content": full_text}}
+    response = _push_session.post(url, json=body, timeout=5)
+    return response.status_code == 200
 
-    # PushPlus
-    pushplus_token = os.getenv('PUSHPLUS_TOKEN')
-    if pushplus_token:
-        try:
-            url = "http://www.pushplus.plus/send"
-            body = {"token": pushplus_token, "title": title, "content": text}
-            response = requests.post(url, json=body)
-            if response.status_code == 200:
-                log("PushPlus-日志已推送")
-        except:
-            pass
+def _push_pushplus(token, title, text, full_text):
+    url = "http://www.pushplus.plus/send"
+    body = {"token": token, "title": title, "content": text}
+    response = _push_session.post(url, json=body, timeout=5)
+    return response.status_code == 200
 
-    # Server酱
-    serverchan_sckey = os.getenv('SERVERCHAN_SCKEY')
-    if serverchan_sckey:
-        try:
-            url = f"https://sctapi.ftqq.com/{serverchan_sckey}.send"
-            body = {"title": title, "desp": text}
-            response = requests.post(url, data=body)
-            if response.status_code == 200:
-                log("Server酱-日志已推送")
-        except:
-            pass
+def _push_serverchan(sckey, title, text, full_text):
+    url = f"https://sctapi.ftqq.com/{sckey}.send"
+    body = {"title": title, "desp": text}
+    response = _push_session.post(url, data=body, timeout=5)
+    return response.status_code == 200
 
-    # Server酱3
-    serverchan3_sckey = os.getenv('SERVERCHAN3_SCKEY') 
-    if serverchan3_sckey:
-        try:
-            textSC3 = "\n\n".join(summary_logs)
-            titleSC3 = title
-            options = {"tags": "嘉立创|签到"}  # 可选参数，根据需求添加
-            response = sc_send(serverchan3_sckey, titleSC3, textSC3, options)            
-            if response.get("code") == 0:  # 新版成功返回 code=0
-                log("Server酱3-日志已推送")
-            else:
-                log(f"Server酱推送失败: {response.get('message')}")                
-        except Exception as e:
-            log(f"Server酱推送异常: {str(e)}")    
+def _push_serverchan3(sckey, title, text, full_text):
+    try:
+        textSC3 = text.replace("\n", "\n\n")  # Server酱3 使用 Markdown，需要空行分段
+        options = {"tags": "嘉立创|签到"}  # 可选参数，根据需求添加
+        response = sc_send(sckey, title, textSC3, options)
+        if response.get("code") == 0:  # 新版成功返回 code=0
+            return True
+        log(f"Server酱推送失败: {response.get('message')}")
+    except Exception as e:
+        log(f"Server酱推送异常: {str(e)}")
+    return False
 
-    # 酷推 (CoolPush)
-    coolpush_skey = os.getenv('COOLPUSH_SKEY')
-    if coolpush_skey:
-        try:
-            url = f"https://push.xuthus.cc/send/{coolpush_skey}?c={full_text}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                log("酷推-日志已推送")
-        except:
-            pass
+def _push_coolpush(skey, title, text, full_text):
+    url = f"https://push.xuthus.cc/send/{skey}?c={full_text}"
+    response = _push_session.get(url, timeout=5)
+    return response.status_code == 200
+
+def _push_custom(webhook, title, text, full_text):
+    body = {"title": title, "content": text}
+    response = _push_session.post(webhook, json=body, timeout=5)
+    return response.status_code == 200
+
+# 推送渠道：(名称, 推送函数, 需要的环境变量)，环境变量全部配置后才启用
+PUSH_CHANNELS = (
+    ("Telegram", _push_telegram, ('TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID')),
+    ("企业微信", _push_wechat, ('WECHAT_WEBHOOK_KEY',)),
+    ("钉钉", _push_dingtalk, ('DINGTALK_WEBHOOK',)),
+    ("PushPlus", _push_pushplus, ('PUSHPLUS_TOKEN',)),
+    ("Server酱", _push_serverchan, ('SERVERCHAN_SCKEY',)),
+    ("Server酱3", _push_serverchan3, ('SERVERCHAN3_SCKEY',)),
+    ("酷推", _push_coolpush, ('COOLPUSH_SKEY',)),
+    ("自定义API", _push_custom, ('CUSTOM_WEBHOOK',)),
+)
+
+# 启动时一次性读取推送相关的环境变量，并确定已启用的渠道
+PUSH_CONFIG = {key: os.getenv(key) for _, _, env_keys in PUSH_CHANNELS for key in env_keys}
+ENABLED_PUSH_CHANNELS = [
+    (name, functools.partial(push, *[PUSH_CONFIG[key] for key in env_keys]))
+    for name, push, env_keys in PUSH_CHANNELS
+    if all(PUSH_CONFIG[key] for key in env_keys)
+]
 
-    # 自定义API
-    custom_webhook = os.getenv('CUSTOM_WEBHOOK')
-    if custom_webhook:
+def push_summary(summary_logs):
+    if not summary_logs or not ENABLED_PUSH_CHANNELS:
+        return
+    
+    title = "嘉立创签到总结"
+    text = "\n".join(summary_logs)
+    full_text = f"{title}\n{text}"  # 有些平台不需要单独标题
+    
+    def run_channel(channel):
+        name, push = channel
         try:
-            body = {"title": title, "content": text}
-            response = requests.post(custom_webhook, json=body)
-            if response.status_code == 200:
-                log("自定义API-日志已推送")
+            if push(title, text, full_text):
+                log(f"{name}-日志已推送")
         except:
-            pass
+            pass  # 静默失败
+    
+    # 各渠道互不依赖，并发推送
+    with ThreadPoolExecutor(max_workers=len(ENABLED_PUSH_CHANNELS)) as executor:
+        list(executor.map(run_channel, ENABLED_PUSH_CHANNELS))
 
 def main():
-    global in_summary
-    
     if len(sys.argv) < 3:
         print("用法: python jlc.py 账号1,账号2,账号3... 密码1,密码2,密码3... [失败退出标志]")
         print("示例: python jlc.py user1,user2,user3 pwd1,pwd2,pwd3")
@@ -1288,28 +2038,35 @@ def main():
     total_accounts = len(usernames)
     log(f"开始处理 {total_accounts} 个账号的签到任务")
     
-    # 存储所有账号的结果
-    all_results = []
+    # 多个账号并发处理，每个账号使用独立的浏览器和用户数据目录
+    max_workers = max(1, min(total_accounts, MAX_WORKERS))
     
-    for i, (username, password) in enumerate(zip(usernames, passwords), 1):
+    def run_account(i):
+        if i <= max_workers:
+            time.sleep((i - 1) * 0.5)  # 首批账号错开启动，避免同时请求登录接口
         log(f"开始处理第 {i} 个账号")
-        result = process_single_account(username, password, i, total_accounts)
-        all_results.append(result)
-        
-        if i < total_accounts:
-            wait_time = random.randint(3, 5)
-            log(f"等待 {wait_time} 秒后处理下一个账号...")
-            time.sleep(wait_time)
-    
-    # 检查是否有失败的账号，执行最终重试（排除密码错误的）
-    has_failed_accounts = any((not result['oshwhub_success'] or not result['jindou_success']) and not result.get('password_error', False) for result in all_results)
+        return process_single_account(usernames[i - 1], passwords[i - 1], i, total_accounts)
     
-    if has_failed_accounts:
-        all_results = execute_final_retry_for_failed_accounts(all_results, usernames, passwords, total_accounts)
+    try:
+        # 存储所有账号的结果（按账号顺序）
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_results = list(executor.map(run_account, range(1, total_accounts + 1)))
+        
+        # 检查是否有失败的账号，执行最终重试（排除密码错误的）
+        failed_results = [result for result in all_results if result['failed']]
+        has_failed_accounts = bool(failed_results)
+        
+        if has_failed_accounts:
+            all_results = execute_final_retry_for_failed_accounts(all_results, failed_results, usernames, passwords, total_accounts)
+    finally:
+        # 无论是否出错都关闭浏览器池，避免遗留 Chrome 进程
+        browser_pool.close()
+        _background_executor.shutdown(wait=False)
     
     # 输出详细总结
     log("=" * 70)
-    in_summary = True  # 启用总结收集
+    summary_logs = []
+    summary_logs_var.set(summary_logs)  # 启用总结收集，仅对主线程生效
     log("?? 详细签到任务完成总结")
     log("=" * 70)
     
@@ -1320,8 +2077,10 @@ def main():
     retried_accounts = []  # 合并所有重试过的账号，包括最终重试
     password_error_accounts = []  # 密码错误的账号
     
-    # 记录失败的账号
+    # 记录失败的账号（failed_oshwhub / failed_jindou 按平台区分，均排除密码错误）
     failed_accounts = []
+    failed_oshwhub = []
+    failed_jindou = []
     
     for result in all_results:
         account_index = result['account_index']
@@ -1337,8 +2096,12 @@ def main():
             retried_accounts.append(account_index)
         
         # 检查是否有失败情况（排除密码错误）
-        if (not result['oshwhub_success'] or not result['jindou_success']) and not password_error:
+        if result['failed']:
             failed_accounts.append(account_index)
+            if not result['oshwhub_success']:
+                failed_oshwhub.append(account_index)
+            if not result['jindou_success']:
+                failed_jindou.append(account_index)
         
         retry_label = ""
         if retry_count > 0:
@@ -1346,47 +2109,59 @@ def main():
         elif is_final_retry:
             retry_label = " [最终重试]"
         
-        # 密码错误账号的特殊显示
+        # 每个账号的详细结果先拼成多行，再一次性输出
         if password_error:
-            log(f"账号 {account_index} (未知) 详细结果: [密码错误]")
-            log("  └── 状态: ? 账号或密码错误，跳过此账号")
+            # 密码错误账号的特殊显示
+            lines = [
+                f"账号 {account_index} (未知) 详细结果: [密码错误]",
+                "  └── 状态: ? 账号或密码错误，跳过此账号",
+            ]
         else:
-            log(f"账号 {account_index} ({nickname}) 详细结果:{retry_label}")
-            log(f"  ├── 开源平台: {result['oshwhub_status']}")
+            initial_points = result['initial_points']
+            final_points = result['final_points']
+            points_reward = result['points_reward']
+            initial_jindou = result['initial_jindou']
+            final_jindou = result['final_jindou']
+            jindou_reward = result['jindou_reward']
+            
+            lines = [
+                f"账号 {account_index} ({nickname}) 详细结果:{retry_label}",
+                f"  ├── 开源平台: {result['oshwhub_status']}",
+            ]
             
             # 显示积分变化
-            if result['points_reward'] > 0:
-                log(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (+{result['points_reward']})")
-                total_points_reward += result['points_reward']
-            elif result['points_reward'] == 0 and result['initial_points'] > 0:
-                log(f"  ├── 积分变化: {result['initial_points']} → {result['final_points']} (0)")
+            if points_reward > 0:
+                lines.append(f"  ├── 积分变化: {initial_points} → {final_points} (+{points_reward})")
+                total_points_reward += points_reward
+            elif points_reward == 0 and initial_points > 0:
+                lines.append(f"  ├── 积分变化: {initial_points} → {final_points} (0)")
             else:
-                log(f"  ├── 积分状态: 无法获取积分信息")
+                lines.append("  ├── 积分状态: 无法获取积分信息")
             
-            log(f"  ├── 金豆签到: {result['jindou_status']}")
+            lines.append(f"  ├── 金豆签到: {result['jindou_status']}")
             
             # 显示金豆变化
-            if result['jindou_reward'] > 0:
-                jindou_text = f"  ├── 金豆变化: {result['initial_jindou']} → {result['final_jindou']} (+{result['jindou_reward']})"
+            if jindou_reward > 0:
+                jindou_text = f"  ├── 金豆变化: {initial_jindou} → {final_jindou} (+{jindou_reward})"
                 if result['has_jindou_reward']:
                     jindou_text += "（有奖励）"
-                log(jindou_text)
-                total_jindou_reward += result['jindou_reward']
-            elif result['jindou_reward'] == 0 and result['initial_jindou'] > 0:
-                log(f"  ├── 金豆变化: {result['initial_jindou']} → {result['final_jindou']} (0)")
+                lines.append(jindou_text)
+                total_jindou_reward += jindou_reward
+            elif jindou_reward == 0 and initial_jindou > 0:
+                lines.append(f"  ├── 金豆变化: {initial_jindou} → {final_jindou} (0)")
             else:
-                log(f"  ├── 金豆状态: 无法获取金豆信息")
+                lines.append("  ├── 金豆状态: 无法获取金豆信息")
             
             # 显示礼包领取结果
-            for reward_result in result['reward_results']:
-                log(f"  ├── {reward_result}")
+            lines.extend(f"  ├── {reward_result}" for reward_result in result['reward_results'])
             
             if result['oshwhub_success']:
                 oshwhub_success_count += 1
             if result['jindou_success']:
                 jindou_success_count += 1
         
-        log("  " + "-" * 50)
+        lines.append("  " + "-" * 50)
+        log("\n".join(lines))
     
     # 总体统计
     log("?? 总体统计:")
@@ -1407,10 +2182,7 @@ def main():
     log(f"  ├── 开源平台成功率: {oshwhub_rate:.1f}%")
     log(f"  └── 金豆签到成功率: {jindou_rate:.1f}%")
     
-    # 失败账号列表（排除密码错误）
-    failed_oshwhub = [r['account_index'] for r in all_results if not r['oshwhub_success'] and not r.get('password_error', False)]
-    failed_jindou = [r['account_index'] for r in all_results if not r['jindou_success'] and not r.get('password_error', False)]
-    
+    # 失败账号列表（排除密码错误），已在上方遍历结果时收集
     if failed_oshwhub:
         log(f"  ? 开源平台失败账号: {', '.join(map(str, failed_oshwhub))}")
     
@@ -1428,7 +2200,7 @@ def main():
     log("=" * 70)
     
     # 推送总结
-    push_summary()
+    push_summary(summary_logs)
     
     # 根据失败退出标志决定退出码
     all_failed_accounts = failed_accounts + password_error_accounts